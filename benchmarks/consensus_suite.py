@@ -0,0 +1,278 @@
+"""Times the consensus hot paths over sweeps of validator counts and chain depths,
+on synthetic views built from fixed seeds. Results are written as JSON, and can be
+compared against a stored baseline to catch regressions."""
+import argparse
+import gc
+import json
+import platform
+import random as r
+import sys
+import time
+
+from casper.blockchain.block import Block
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+import casper.blockchain.forkchoice as forkchoice
+from casper.justification import Justification, PersistentMap
+from casper.safety_oracles.adversary_oracle import AdversaryOracle
+from casper.safety_oracles.agreement_graph import AgreementGraph
+from casper.safety_oracles.clique_oracle import CliqueOracle
+from casper.safety_oracles.turan_oracle import TuranOracle
+from casper.utils import exists_free_message
+from casper.validator_set import ValidatorSet
+
+# (validators, depth) of each workload. Validator counts are swept at a fixed depth,
+# and depths at a fixed validator count.
+FULL_SWEEP = [(5, 1000), (50, 1000), (500, 1000), (10, 10), (10, 100), (10, 10000)]
+QUICK_SWEEP = [(5, 200), (50, 200), (10, 10), (10, 100), (10, 1000)]
+
+FORK_RATE = 0.1
+
+
+class Workload(object):
+    """A global view of a seeded chain of messages, with some forks, where every message is
+    justified by the latest message of every validator. depth is the number of messages."""
+
+    def __init__(self, num_validators, depth, seed):
+        self.num_validators = num_validators
+        self.depth = depth
+
+        rng = r.Random("{}-{}-{}".format(seed, num_validators, depth))
+        self.validator_set = ValidatorSet(
+            {name: rng.uniform(10, 100) for name in range(num_validators)},
+            BlockchainProtocol
+        )
+        validators = self.validator_set.sorted_by_name()
+
+        latest_messages = PersistentMap()
+        self.messages = []
+        parent = None
+        for i in range(depth):
+            sender = validators[i % num_validators]
+            # mostly build on the newest block, sometimes on an older latest message
+            if parent is not None and rng.random() < FORK_RATE:
+                parent = latest_messages[rng.choice(list(latest_messages))]
+
+            parent = Block(parent, Justification(latest_messages), sender)
+            self.messages.append(parent)
+            latest_messages = latest_messages.set(sender, parent)
+
+        self.view = BlockchainProtocol.View()
+        self.view.add_messages(self.messages)
+
+        # Half of the messages, to be caught up with the rest.
+        self.half_view = BlockchainProtocol.View()
+        self.half_view.add_messages(self.messages[:depth // 2])
+
+        # The oracles check the block halfway down the fork choice.
+        tip = self.view.estimate()
+        self.candidate = tip.get_ancestor_at_height(max(1, tip.height // 2))
+
+
+def best_time(run, setup=None, repeat=5):
+    """Returns the best time to call run, each time on a fresh result of setup if given.
+    As with timeit, garbage collection is turned off while timing."""
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    return min(times)
+
+
+def time_get_fork_choice(workload, repeat):
+    """Computes the fork choice of the whole view from scratch."""
+    view = workload.view
+
+    def run(_):
+        forkchoice.get_fork_choice(None, view.children, view.latest_messages)
+
+    return best_time(run, repeat=repeat)
+
+
+def time_get_new_messages(workload, repeat):
+    """Finds the messages a view of half the chain has not seen."""
+    showed_messages = set(workload.view.latest_messages.values())
+
+    def run(_):
+        workload.half_view.get_new_messages(showed_messages)
+
+    return best_time(run, repeat=repeat)
+
+
+def time_add_messages(workload, repeat):
+    """Adds every message to an empty view."""
+    def run(view):
+        view.add_messages(workload.messages)
+
+    return best_time(run, BlockchainProtocol.View, repeat)
+
+
+def _time_oracle(oracle_class, workload, repeat):
+    view = workload.view
+
+    def setup():
+        # checks start cold, without agreement remembered from earlier checks
+        view.agreement_graph = AgreementGraph(view)
+
+    def run(_):
+        oracle_class(workload.candidate, view, workload.validator_set).check_estimate_safety()
+
+    return best_time(run, setup, repeat)
+
+
+def time_clique_oracle(workload, repeat):
+    """Checks the safety of the candidate with the clique oracle."""
+    return _time_oracle(CliqueOracle, workload, repeat)
+
+
+def time_turan_oracle(workload, repeat):
+    """Checks the safety of the candidate with the Turan oracle."""
+    return _time_oracle(TuranOracle, workload, repeat)
+
+
+def time_adversary_oracle(workload, repeat):
+    """Checks the safety of the candidate with the adversary oracle."""
+    return _time_oracle(AdversaryOracle, workload, repeat)
+
+
+def time_exists_free_message(workload, repeat):
+    """Searches every validator's messages for one conflicting with the candidate."""
+    view = workload.view
+    validators = [v for v in workload.validator_set.sorted_by_name() if v in view.latest_messages]
+
+    def run(_):
+        for validator in validators:
+            exists_free_message(workload.candidate, validator, 0, view)
+
+    return best_time(run, repeat=repeat)
+
+
+BENCHMARKS = [
+    ('get_fork_choice', time_get_fork_choice),
+    ('get_new_messages', time_get_new_messages),
+    ('add_messages', time_add_messages),
+    ('clique_oracle', time_clique_oracle),
+    ('turan_oracle', time_turan_oracle),
+    ('adversary_oracle', time_adversary_oracle),
+    ('exists_free_message', time_exists_free_message),
+]
+
+
+def run_suite(sweep, seed=0, repeat=5, only=None):
+    """Returns the results of the benchmarks named in only, or all of them,
+    on each workload of the sweep."""
+    results = []
+    for num_validators, depth in sweep:
+        workload = Workload(num_validators, depth, seed)
+        for name, benchmark in BENCHMARKS:
+            if only and name not in only:
+                continue
+
+            seconds = benchmark(workload, repeat)
+            results.append({
+                'benchmark': name,
+                'validators': num_validators,
+                'depth': depth,
+                'seconds': seconds
+            })
+            print("{:<20} validators={:<4} depth={:<6} {:>10.3f} ms".format(
+                name, num_validators, depth, 1000 * seconds
+            ))
+
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'results': results
+    }
+
+
+def compare(results, baseline, tolerance, noise_floor):
+    """Returns the regressions of results against baseline: the benchmarks that took
+    more than (1 + tolerance) times as long, and longer by more than the noise floor."""
+    def key(result):
+        return (result['benchmark'], result['validators'], result['depth'])
+
+    baseline_seconds = {key(result): result['seconds'] for result in baseline['results']}
+
+    regressions = []
+    for result in results['results']:
+        before = baseline_seconds.get(key(result))
+        if before is None:
+            continue
+
+        after = result['seconds']
+        if after > before * (1 + tolerance) and after - before > noise_floor:
+            regressions.append((key(result), before, after))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the consensus hot paths.')
+    parser.add_argument(
+        '--quick', action='store_true',
+        help='runs a smaller sweep of validator counts and chain depths'
+    )
+    parser.add_argument(
+        '--only', type=str, nargs='+', choices=[name for name, _ in BENCHMARKS],
+        help='specifies the benchmarks to run'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='specifies the number of times to repeat each timing'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='specifies the seed of the synthetic views'
+    )
+    parser.add_argument(
+        '--output', type=str,
+        help='specifies a file to write the results to as JSON'
+    )
+    parser.add_argument(
+        '--compare', type=str,
+        help='specifies a baseline results file to compare against'
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=0.5,
+        help='specifies the relative slowdown from the baseline that is a regression'
+    )
+    parser.add_argument(
+        '--noise-floor', type=float, default=0.001,
+        help='specifies the slowdown in seconds below which timings are not compared'
+    )
+    args = parser.parse_args()
+
+    sweep = QUICK_SWEEP if args.quick else FULL_SWEEP
+    results = run_suite(sweep, args.seed, args.repeat, args.only)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+            output.write('\n')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare(results, baseline, args.tolerance, args.noise_floor)
+        for (name, num_validators, depth), before, after in regressions:
+            print("REGRESSION {} validators={} depth={}: {:.3f} ms -> {:.3f} ms".format(
+                name, num_validators, depth, 1000 * before, 1000 * after
+            ))
+
+        if regressions:
+            sys.exit(1)
+        print("No regressions against {}".format(args.compare))
+
+
+if __name__ == '__main__':
+    main()
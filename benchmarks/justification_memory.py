@@ -0,0 +1,71 @@
+"""Measures the memory used by the justifications of a long run of messages,
+with justifications sharing structure versus each holding a full copy."""
+import argparse
+import random as r
+import tracemalloc
+
+from casper.blockchain.block import Block
+from casper.justification import Justification, PersistentMap
+from casper.validator import Validator
+
+
+def build_messages(num_validators, num_messages, share):
+    """Builds a chain of messages, each justified by the latest message of every validator."""
+    validators = [Validator(name, r.uniform(10, 100)) for name in range(num_validators)]
+
+    latest_messages = PersistentMap()
+    messages = []
+    parent = None
+    for i in range(num_messages):
+        sender = validators[i % num_validators]
+
+        if share:
+            justification = Justification(latest_messages)
+        else:
+            justification = Justification.__new__(Justification)
+            justification.latest_messages = dict(latest_messages)
+
+        parent = Block(parent, justification, sender)
+        messages.append(parent)
+        latest_messages = latest_messages.set(sender, parent)
+
+    return messages
+
+
+def measure(num_validators, num_messages, share):
+    """Returns the number of bytes allocated to build the messages."""
+    tracemalloc.start()
+    messages = build_messages(num_validators, num_messages, share)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(messages) == num_messages
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure justification memory usage.')
+    parser.add_argument(
+        '--validators', type=int, default=500,
+        help='specifies the number of validators'
+    )
+    parser.add_argument(
+        '--messages', type=int, default=5000,
+        help='specifies the number of messages to build'
+    )
+    args = parser.parse_args()
+
+    r.seed(0)
+    copied = measure(args.validators, args.messages, share=False)
+    r.seed(0)
+    shared = measure(args.validators, args.messages, share=True)
+
+    print("validators:\t{}".format(args.validators))
+    print("messages:\t{}".format(args.messages))
+    print("copied:\t\t{:.1f} MiB".format(copied / 2 ** 20))
+    print("shared:\t\t{:.1f} MiB".format(shared / 2 ** 20))
+    print("reduction:\t{:.1f}x".format(copied / shared))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Times the set and dict heavy hot paths that hash and compare messages:
+adding messages to a view, and computing the fork choice."""
+import argparse
+import random as r
+import timeit
+
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+import casper.blockchain.forkchoice as forkchoice
+from simulations.simulation_runner import SimulationRunner
+from simulations.utils import (
+    generate_random_gaussian_validator_set,
+    message_maker
+)
+
+
+def build_global_view(num_validators, num_rounds, mode, seed=0):
+    """Runs a headless simulation, seeded so it always does the same work,
+    and returns its global view."""
+    rng = r.Random(seed)
+    validator_set = generate_random_gaussian_validator_set(
+        BlockchainProtocol,
+        num_validators,
+        rng=rng
+    )
+    runner = SimulationRunner(
+        validator_set,
+        message_maker(mode, rng),
+        BlockchainProtocol,
+        total_rounds=num_rounds,
+        report_interval=num_rounds,
+        display=False,
+        save=False
+    )
+    for _ in range(num_rounds):
+        runner.step()
+
+    return runner.network.global_view
+
+
+def time_add_messages(global_view, repeat):
+    """Returns the best time to add every message of global_view to an empty view."""
+    def add_messages():
+        BlockchainProtocol.View().add_messages(global_view.messages)
+
+    return min(timeit.repeat(add_messages, number=1, repeat=repeat))
+
+
+def time_get_fork_choice(global_view, repeat):
+    """Returns the best time to compute the fork choice of global_view from scratch."""
+    def get_fork_choice():
+        forkchoice.get_fork_choice(
+            global_view.last_finalized_block,
+            global_view.children,
+            global_view.latest_messages
+        )
+
+    return min(timeit.repeat(get_fork_choice, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time add_messages and get_fork_choice.')
+    parser.add_argument(
+        '--validators', type=int, default=20,
+        help='specifies the number of validators'
+    )
+    parser.add_argument(
+        '--rounds', type=int, default=100,
+        help='specifies the number of rounds to simulate'
+    )
+    parser.add_argument(
+        '--mode', type=str, default='rand',
+        help='specifies how to generate and propogate new messages'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='specifies the number of times to repeat each timing'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='specifies the seed of the simulated workload'
+    )
+    args = parser.parse_args()
+
+    global_view = build_global_view(args.validators, args.rounds, args.mode, args.seed)
+
+    print("messages:\t{}".format(len(global_view.messages)))
+    print("add_messages:\t{:.2f} ms".format(
+        1000 * time_add_messages(global_view, args.repeat)
+    ))
+    print("get_fork_choice:\t{:.2f} ms".format(
+        1000 * time_get_fork_choice(global_view, args.repeat)
+    ))
+
+
+if __name__ == '__main__':
+    main()
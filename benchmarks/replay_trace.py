@@ -0,0 +1,50 @@
+"""Times replaying a recorded simulation trace, so the views, safety checks and Analyzer
+can be compared across changes on exactly the same workload. Record a trace with
+casper.py --trace."""
+import argparse
+import time
+
+from simulations.analyzer import Analyzer
+from simulations.trace import TraceReplayer
+
+
+def time_replay(path, check_safety, analyze):
+    """Returns the time to replay a trace, and the replayer."""
+    start = time.perf_counter()
+    replayer = TraceReplayer(path, check_safety)
+    if analyze:
+        Analyzer(replayer)
+    replayer.run()
+
+    return time.perf_counter() - start, replayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time replaying a simulation trace.')
+    parser.add_argument(
+        'trace', type=str,
+        help='specifies the trace to replay'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='specifies the number of times to repeat each timing'
+    )
+    args = parser.parse_args()
+
+    runs = [
+        ('views only', False, False),
+        ('with safety checks', True, False),
+        ('with safety checks and analyzer', True, True),
+    ]
+    for name, check_safety, analyze in runs:
+        best, replayer = min(
+            (time_replay(args.trace, check_safety, analyze) for _ in range(args.repeat)),
+            key=lambda result: result[0]
+        )
+        print("{}:\t{:.2f} ms ({} rounds, {} messages)".format(
+            name, 1000 * best, replayer.round, len(replayer.messages)
+        ))
+
+
+if __name__ == '__main__':
+    main()
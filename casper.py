@@ -9,6 +9,7 @@ this manner, yet... :)
 
 import argparse
 from configparser import ConfigParser
+import random
 
 from simulations.simulation_runner import SimulationRunner
 from simulations.utils import (
@@ -57,16 +58,37 @@ def main():
     parser.add_argument(
         '--save', help='hide simulation display', action='store_true'
     )
+    parser.add_argument(
+        '--save-in-background', help='encode saved viewgraphs in a separate process',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--window', type=int, default=None,
+        help='only draws messages within this many display heights of the latest messages'
+    )
+    parser.add_argument(
+        '--trace', type=str, default=None,
+        help='specifies a file to record a trace of the simulation to, for replaying'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=None,
+        help='specifies the seed of the random choices made, to replay a simulation'
+    )
 
     args = parser.parse_args()
     protocol = select_protocol(args.protocol)
 
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    print("Seed: {}".format(seed))
+    rng = random.Random(seed)
+
     validator_set = generate_random_gaussian_validator_set(
         protocol,
-        args.validators
+        args.validators,
+        rng=rng
     )
 
-    msg_gen = message_maker(args.mode)
+    msg_gen = message_maker(args.mode, rng)
     display = not args.hide_display
 
     simulation_runner = SimulationRunner(
@@ -77,6 +99,9 @@ def main():
         report_interval=args.report_interval,
         display=display,
         save=args.save,
+        background_save=args.save_in_background,
+        window=args.window,
+        trace=args.trace,
     )
     simulation_runner.run()
 
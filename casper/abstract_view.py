@@ -1,10 +1,17 @@
 """The view module ... """
-from casper.justification import Justification
+from collections import OrderedDict
+
+from casper.justification import Justification, PersistentMap
+from casper.safety_oracles.agreement_graph import AgreementGraph
 
 
 class AbstractView(object):
-    """A set of seen messages. For performance, also stores a dict of most recent messages."""
-    def __init__(self, messages=None):
+    """A set of seen messages. For performance, also stores a map of most recent messages.
+    The map is persistent, so it can be shared with the justifications of new messages."""
+
+    SAFETY_CACHE_SIZE = 1024
+
+    def __init__(self, messages=None, rng=None):
         # now for some assignment...
         if messages is None:
             messages = set()
@@ -12,7 +19,24 @@ class AbstractView(object):
         self.add_messages(messages)
 
         self.messages = set()
-        self.latest_messages = dict()
+        self.latest_messages = PersistentMap()
+
+        # messages from each validator, indexed by sequence number
+        self.messages_by_sender = dict()
+
+        # agreement between validators on candidate estimates, kept across safety checks
+        self.agreement_graph = AgreementGraph(self)
+
+        # bumped whenever latest_messages changes, so results computed from a view can
+        # be cached until it next changes
+        self.version = 0
+        self.safety_cache = OrderedDict()
+
+        # notified as messages are added and estimates finalized, see add_listener
+        self.listeners = []
+
+        # source of any randomness in making messages, or None for the random module
+        self.rng = rng
 
     def __str__(self):
         output = "View: \n"
@@ -24,40 +48,109 @@ class AbstractView(object):
         """Returns the latest messages seen from other validators, to justify estimate."""
         return Justification(self.latest_messages)
 
+    def add_listener(self, listener):
+        """Notifies a listener of changes to the view. If it defines them, the listener's
+        on_messages_added(view, messages) is called with newly added messages, and
+        on_estimates_finalized(view, estimates) with newly finalized estimates."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stops notifying a listener of changes to the view."""
+        self.listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        for listener in self.listeners:
+            handler = getattr(listener, event, None)
+            if handler is not None:
+                handler(self, *args)
+
     def get_new_messages(self, showed_messages):
         """This method returns the set of messages out of showed_messages
         and their dependency that isn't part of the view."""
 
-        new_messages = set()
-        # The memo will keep track of messages we've already looked at, so we don't redo work.
-        memo = set()
-
-        # At the start, our working set will be the "showed messages" parameter.
-        current_set = set(showed_messages)
-        while current_set != set():
-
-            next_set = set()
-            # If there's no message in the current working set.
-            for message in current_set:
+        # Messages from a validator are seen in sequence, so a message is new exactly when
+        # its sequence number is past the frontier of messages seen from its sender.
+        # As a validator's view only grows, the justification of its highest new message
+        # covers the justifications of its earlier ones. So only that justification is
+        # searched for new messages from others; the rest are on the sender's own chain.
+        highest_new = dict()
 
-                # Which we haven't seen it in the view or during this loop.
-                if message not in self.messages and message not in memo:
+        to_check = [message for message in showed_messages if self._is_new(message)]
+        while to_check:
+            message = to_check.pop()
 
-                    # But if we do have a new message, then we add it to our pile..
-                    new_messages.add(message)
+            highest = highest_new.get(message.sender)
+            if highest is not None and highest.sequence_number >= message.sequence_number:
+                continue
+            highest_new[message.sender] = message
 
-                    # and add the bet in its justification to our next working set
-                    for bet in message.justification.latest_messages.values():
-                        next_set.add(bet)
-                    # Keeping a record of very message we inspect, being sure not
-                    # to do any extra (exponential complexity) work.
-                    memo.add(message)
+            for justified in message.justification.latest_messages.values():
+                if self._is_new(justified):
+                    to_check.append(justified)
 
-            current_set = next_set
+        new_messages = set()
+        for sender, message in highest_new.items():
+            frontier = self._frontier(sender)
+            while message is not None and message.sequence_number >= frontier:
+                new_messages.add(message)
+                message = message.justification.latest_messages.get(sender)
 
-        # After the loop is done, we return a set of new messages.
         return new_messages
 
+    def _frontier(self, validator):
+        """Returns the sequence number of the next message to be seen from a validator."""
+        return len(self.messages_by_sender.get(validator, ()))
+
+    def _is_new(self, message):
+        return message.sequence_number >= self._frontier(message.sender)
+
+    def get_message(self, validator, sequence_number):
+        """Returns the message some validator sent with some sequence number."""
+        return self.messages_by_sender[validator][sequence_number]
+
+    def get_messages(self, validator, start=0, stop=None):
+        """Returns the messages some validator sent with sequence numbers in [start, stop)."""
+        return self.messages_by_sender.get(validator, [])[start:stop]
+
+    def _add_to_sequence_index(self, new_messages):
+        for message in sorted(new_messages, key=lambda m: m.sequence_number):
+            sender_messages = self.messages_by_sender.setdefault(message.sender, [])
+            assert message.sequence_number == len(sender_messages), \
+                "...expected to see messages from a validator in sequence"
+            sender_messages.append(message)
+
+    def check_estimate_safety(self, candidate_estimate, validator_set, oracle_class):
+        """Returns the (fault_tolerance, num_node_ft) an oracle finds for a candidate_estimate.
+        Results are cached for each validator set until the view's latest messages change."""
+        key = (candidate_estimate, validator_set, oracle_class, self.version)
+        if key in self.safety_cache:
+            self.safety_cache.move_to_end(key)
+            return self.safety_cache[key]
+
+        oracle = oracle_class(candidate_estimate, self, validator_set)
+        self.safety_cache[key] = oracle.check_estimate_safety()
+
+        if len(self.safety_cache) > self.SAFETY_CACHE_SIZE:
+            self.safety_cache.popitem(last=False)
+
+        return self.safety_cache[key]
+
+    def _update_latest_messages(self, updates):
+        """Sets the latest message of some validators."""
+        if not updates:
+            return
+
+        self.latest_messages = self.latest_messages.update(updates)
+        self.version += 1
+
+    def _latest_message_updates(self, new_messages):
+        """Returns the new latest message of each validator that sent one of new_messages.
+        Expects new_messages to already be in the sequence index."""
+        return {
+            message.sender: self.messages_by_sender[message.sender][-1]
+            for message in new_messages
+        }
+
     def estimate(self):
         '''Must be defined in child class.
         Returns estimate based on current messages in the view'''
@@ -5,6 +5,8 @@ from casper.message import Message
 class Bet(Message):
     """Message data structure for blockchain consensus"""
 
+    __slots__ = ()
+
     def __init__(self, estimate, justification, sender):
         # Do some type checking for safety!
         assert estimate in {0, 1}, "... estimate should be binary!"
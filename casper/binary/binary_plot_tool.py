@@ -8,8 +8,8 @@ import casper.utils as utils
 class BinaryPlotTool(PlotTool):
     """The module contains functions for plotting a binary data structure"""
 
-    def __init__(self, display, save, view, validator_set):
-        super().__init__(display, save, 'o')
+    def __init__(self, display, save, view, validator_set, background_save=False, window=None):
+        super().__init__(display, save, 'o', background_save, window)
         self.view = view
         self.validator_set = validator_set
 
@@ -34,6 +34,12 @@ class BinaryPlotTool(PlotTool):
         self._update_message_fault_tolerance()
         self._update_message_labels(new_messages)
 
+        if self.window is not None:
+            self.communications = self.in_window(self.communications, self.view)
+            self.self_communications = self.in_window(self.self_communications, self.view)
+            self.bet_fault_tolerance = self.entries_in_window(self.bet_fault_tolerance, self.view)
+            self.message_labels = self.entries_in_window(self.message_labels, self.view)
+
     def plot(self):
         """Builds relevant edges to display and creates next viegraph using them"""
         if self.first_time:
@@ -80,8 +86,11 @@ class BinaryPlotTool(PlotTool):
             if latest_message in self.bet_fault_tolerance:
                 continue
 
-            oracle = CliqueOracle(latest_message, validator.view, self.validator_set)
-            fault_tolerance, num_node_ft = oracle.check_estimate_safety()
+            fault_tolerance, num_node_ft = validator.view.check_estimate_safety(
+                latest_message,
+                self.validator_set,
+                CliqueOracle
+            )
 
             if fault_tolerance > 0:
                 self.bet_fault_tolerance[latest_message] = num_node_ft
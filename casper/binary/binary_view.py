@@ -9,8 +9,8 @@ import random as r
 
 class BinaryView(AbstractView):
     """A view class that also keeps track of a last_finalized_block and children"""
-    def __init__(self, messages=None):
-        super().__init__(messages)
+    def __init__(self, messages=None, rng=None):
+        super().__init__(messages, rng)
 
         self.last_finalized_estimate = None
 
@@ -34,20 +34,21 @@ class BinaryView(AbstractView):
 
         # add these new messages to the messages in view
         self.messages.update(newly_discovered_messages)
+        self._add_to_sequence_index(newly_discovered_messages)
 
         # update views most recently seen messages
-        for message in newly_discovered_messages:
-            if message.sender not in self.latest_messages:
-                self.latest_messages[message.sender] = message
-            elif self.latest_messages[message.sender].sequence_number < message.sequence_number:
-                self.latest_messages[message.sender] = message
+        self._update_latest_messages(self._latest_message_updates(newly_discovered_messages))
+
+        if newly_discovered_messages:
+            self._notify('on_messages_added', newly_discovered_messages)
 
     def make_new_message(self, validator):
         """Make a new bet!"""
         justification = self.justification()
         estimate = self.estimate()
         if not any(self.messages):
-            estimate = r.randint(0, 1)
+            rng = self.rng if self.rng is not None else r
+            estimate = rng.randint(0, 1)
 
         new_message = Bet(estimate, justification, validator)
         self.add_messages(set([new_message]))
@@ -58,11 +59,12 @@ class BinaryView(AbstractView):
         """Checks safety on most recent created by this view"""
         # check estimate safety on the most
         for bet in self.latest_messages.values():
-            oracle = CliqueOracle(bet, self, validator_set)
-            fault_tolerance, _ = oracle.check_estimate_safety()
+            fault_tolerance, _ = self.check_estimate_safety(bet, validator_set, CliqueOracle)
 
             if fault_tolerance > 0:
                 if self.last_finalized_estimate:
                     assert not self.last_finalized_estimate.conflicts_with(bet)
-                self.last_finalized_estimate = bet
+                if bet != self.last_finalized_estimate:
+                    self.last_finalized_estimate = bet
+                    self._notify('on_estimates_finalized', [bet])
                 break
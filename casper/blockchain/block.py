@@ -5,6 +5,8 @@ from casper.message import Message
 class Block(Message):
     """Message data structure for blockchain consensus"""
 
+    __slots__ = ('height', 'skip_list')
+
     def __init__(self, estimate, justification, sender):
         # Do some type checking for safety!
         assert isinstance(estimate, Block) or estimate is None, "...expected a prevblock!"
@@ -17,6 +19,13 @@ class Block(Message):
         else:
             self.height = 1
 
+        # skip_list[i] is the ancestor 2**i blocks back, so any ancestor is O(log(height)) away
+        self.skip_list = []
+        if estimate:
+            self.skip_list.append(estimate)
+            while len(self.skip_list) <= len(self.skip_list[-1].skip_list):
+                self.skip_list.append(self.skip_list[-1].skip_list[len(self.skip_list) - 1])
+
     def conflicts_with(self, message):
         """Returns true if self is not in the prev blocks of other_message"""
         assert isinstance(message, Block), "...expected a block"
@@ -30,7 +39,33 @@ class Block(Message):
         if self == block:
             return True
 
-        if block.estimate is None:
-            return False
+        return self == block.get_ancestor_at_height(self.height)
+
+    def get_ancestor_at_height(self, height):
+        """Returns the ancestor of self (or self) at some height, or None if there is none."""
+        if height > self.height or height < 1:
+            return None
+
+        block = self
+        while block.height != height:
+            distance = block.height - height
+            block = block.skip_list[distance.bit_length() - 1]
+
+        return block
+
+    def get_common_ancestor(self, block):
+        """Returns the highest block that is an ancestor of both self and block, if any."""
+        if self.height > block.height:
+            return self.get_ancestor_at_height(block.height).get_common_ancestor(block)
+        block = block.get_ancestor_at_height(self.height)
+
+        if self == block:
+            return self
+
+        ancestor = self
+        for i in reversed(range(len(ancestor.skip_list))):
+            if i < len(ancestor.skip_list) and ancestor.skip_list[i] != block.skip_list[i]:
+                ancestor = ancestor.skip_list[i]
+                block = block.skip_list[i]
 
-        return self.is_in_blockchain(block.estimate)
+        return ancestor.estimate
@@ -1,15 +1,14 @@
 """The blockchain plot tool implements functions for plotting blockchain data structures"""
 
 from casper.plot_tool import PlotTool
-from casper.safety_oracles.clique_oracle import CliqueOracle
 import casper.utils as utils
 
 
 class BlockchainPlotTool(PlotTool):
     """The module contains functions for plotting a blockchain data structure"""
 
-    def __init__(self, display, save, view, validator_set):
-        super().__init__(display, save, 's')
+    def __init__(self, display, save, view, validator_set, background_save=False, window=None):
+        super().__init__(display, save, 's', background_save, window)
         self.view = view
         self.validator_set = validator_set
         self.message_fault_tolerance = dict()
@@ -33,6 +32,14 @@ class BlockchainPlotTool(PlotTool):
         self._update_block_fault_tolerance()
         self._update_message_labels(new_messages)
 
+        if self.window is not None:
+            self.blockchain = self.in_window(self.blockchain, self.view)
+            self.communications = self.in_window(self.communications, self.view)
+            self.block_fault_tolerance = self.entries_in_window(
+                self.block_fault_tolerance, self.view
+            )
+            self.message_labels = self.entries_in_window(self.message_labels, self.view)
+
     def plot(self):
         """Builds relevant edges to display and creates next viegraph using them"""
         best_chain_edge = self.get_best_chain()
@@ -56,18 +63,50 @@ class BlockchainPlotTool(PlotTool):
     def get_best_chain(self):
         """Returns an edge made of the global forkchoice to genesis"""
         best_message = self.view.estimate()
-        best_chain = utils.build_chain(best_message, None)[:-1]
+        if self.window is None:
+            best_chain = utils.build_chain(best_message, None)[:-1]
+        else:
+            best_chain = utils.build_chain(best_message, self.view.last_finalized_block)
         return utils.edge(best_chain, 5, 'red', 'solid')
 
     def get_validator_chains(self):
-        """Returns a list of edges main from validators current forkchoice to genesis"""
+        """Returns a list of edges main from validators current forkchoice to genesis,
+        or to the bottom of the window"""
+        bottom = self.window_bottom(self.view)
+
         vals_chain_edges = []
         for validator in self.validator_set:
-            chain = utils.build_chain(validator.my_latest_message(), None)[:-1]
+            if bottom is None:
+                chain = utils.build_chain(validator.my_latest_message(), None)[:-1]
+            else:
+                chain = self._chain_in_window(validator.my_latest_message(), bottom)
             vals_chain_edges.append(utils.edge(chain, 2, 'blue', 'solid'))
 
         return vals_chain_edges
 
+    @staticmethod
+    def _chain_in_window(tip, bottom):
+        chain = []
+        while tip is not None and tip.estimate is not None:
+            if tip.estimate.display_height < bottom:
+                break
+            chain.append((tip, tip.estimate))
+            tip = tip.estimate
+
+        return chain
+
+    def _pinned_messages(self, view):
+        """The forkchoice is drawn back to the last finalized block."""
+        pinned = set()
+        block = view.estimate()
+        while block is not None:
+            pinned.add(block)
+            if block == view.last_finalized_block:
+                break
+            block = block.estimate
+
+        return pinned
+
     def _update_communications(self, message_paths, sent_messages, new_messages):
         for sender, receiver in message_paths:
             self.communications.append([sent_messages[sender], new_messages[receiver]])
@@ -82,11 +121,17 @@ class BlockchainPlotTool(PlotTool):
             self.message_labels[message] = message.sequence_number
 
     def _update_block_fault_tolerance(self):
+        sweep = self.view.safety_sweep(self.validator_set)
         tip = self.view.estimate()
 
+        # with a window, fault tolerances are not kept for blocks that are not drawn
+        visible = self.visible_messages(self.view) if self.window is not None else None
+
         while tip and self.block_fault_tolerance.get(tip, 0) != len(self.validator_set) - 1:
-            oracle = CliqueOracle(tip, self.view, self.validator_set)
-            fault_tolerance, num_node_ft = oracle.check_estimate_safety()
+            if visible is not None and tip not in visible:
+                break
+
+            fault_tolerance, num_node_ft = sweep.check_height(tip.height)
 
             if fault_tolerance > 0:
                 self.block_fault_tolerance[tip] = num_node_ft
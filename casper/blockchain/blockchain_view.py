@@ -1,30 +1,38 @@
 """The blockchain view module extends a view for blockchain data structures """
-from casper.safety_oracles.clique_oracle import CliqueOracle
 from casper.abstract_view import AbstractView
 from casper.blockchain.block import Block
+from casper.blockchain.safety_sweep import SafetySweep
 import casper.blockchain.forkchoice as forkchoice
 
 
 class BlockchainView(AbstractView):
     """A view class that also keeps track of a last_finalized_block and children"""
-    def __init__(self, messages=None):
-        super().__init__(messages)
+    def __init__(self, messages=None, rng=None):
+        super().__init__(messages, rng)
 
         self.children = dict()
         self.last_finalized_block = None
 
+        # weight of the latest messages in the sub-tree of each block, kept up to date
+        # as latest_messages change so the fork choice need not recompute it
+        self.scores = dict()
+        self.supporters = dict()
+
         # cache info about message events
         self.when_added = {}
         for message in self.messages:
             self.when_added[message] = 0
         self.when_finalized = {}
 
+        self._safety_sweep = None
+        self._safety_sweep_version = None
+
     def estimate(self):
         """Returns the current forkchoice in this view"""
-        return forkchoice.get_fork_choice(
+        return forkchoice.get_fork_choice_from_scores(
             self.last_finalized_block,
             self.children,
-            self.latest_messages
+            self.scores
         )
 
     def add_messages(self, showed_messages):
@@ -41,14 +49,12 @@ class BlockchainView(AbstractView):
 
         # add these new messages to the messages in view
         self.messages.update(newly_discovered_messages)
+        self._add_to_sequence_index(newly_discovered_messages)
 
-        for message in newly_discovered_messages:
-            # update views most recently seen messages
-            if message.sender not in self.latest_messages:
-                self.latest_messages[message.sender] = message
-            elif self.latest_messages[message.sender].sequence_number < message.sequence_number:
-                self.latest_messages[message.sender] = message
+        # update views most recently seen messages, and the sub-tree weights
+        self._update_latest_messages(self._latest_message_updates(newly_discovered_messages))
 
+        for message in newly_discovered_messages:
             # update the children dictonary with the new message
             if message.estimate not in self.children:
                 self.children[message.estimate] = set()
@@ -58,6 +64,21 @@ class BlockchainView(AbstractView):
             if message not in self.when_added:
                 self.when_added[message] = len(self.messages)
 
+        if newly_discovered_messages:
+            self._notify('on_messages_added', newly_discovered_messages)
+
+    def _update_latest_messages(self, updates):
+        for validator in updates:
+            forkchoice.update_scores(
+                self.scores,
+                self.supporters,
+                self.latest_messages.get(validator),
+                updates[validator],
+                validator.weight
+            )
+
+        super()._update_latest_messages(updates)
+
     def make_new_message(self, validator):
         justification = self.justification()
         estimate = self.estimate()
@@ -67,27 +88,46 @@ class BlockchainView(AbstractView):
 
         return new_message
 
-    def update_safe_estimates(self, validator_set):
-        """Checks safety on messages in views forkchoice, and updates last_finalized_block"""
+    def safety_sweep(self, validator_set):
+        """Returns a SafetySweep of the chain ending at the current forkchoice.
+        It is reused until the view's latest messages change."""
         tip = self.estimate()
+        if tip is None:
+            return None
 
-        prev_last_finalized_block = self.last_finalized_block
-
-        while tip and tip != prev_last_finalized_block:
-            oracle = CliqueOracle(tip, self, validator_set)
-            fault_tolerance, _ = oracle.check_estimate_safety()
+        sweep = self._safety_sweep
+        if sweep is None or sweep.tip != tip or sweep.validator_set is not validator_set or \
+                self._safety_sweep_version != self.version:
+            self._safety_sweep = SafetySweep(tip, self, validator_set)
+            self._safety_sweep_version = self.version
 
-            if fault_tolerance > 0:
-                self.last_finalized_block = tip
-                # then, a sanity check!
-                if prev_last_finalized_block:
-                    assert prev_last_finalized_block.is_in_blockchain(self.last_finalized_block)
+        return self._safety_sweep
 
-                # cache when_finalized
-                while tip and tip not in self.when_finalized:
-                    self.when_finalized[tip] = len(self.messages)
-                    tip = tip.estimate
+    def update_safe_estimates(self, validator_set):
+        """Checks safety on messages in views forkchoice, and updates last_finalized_block"""
+        sweep = self.safety_sweep(validator_set)
+        if sweep is None:
+            return None
 
-                return self.last_finalized_block
+        prev_last_finalized_block = self.last_finalized_block
 
+        # The highest safe block on the forkchoice, above the last finalized block.
+        tip = sweep.deepest_safe_block(prev_last_finalized_block)
+        if tip is None:
+            return None
+
+        self.last_finalized_block = tip
+        # then, a sanity check!
+        if prev_last_finalized_block:
+            assert prev_last_finalized_block.is_in_blockchain(self.last_finalized_block)
+
+        # cache when_finalized
+        newly_finalized = []
+        while tip and tip not in self.when_finalized:
+            self.when_finalized[tip] = len(self.messages)
+            newly_finalized.append(tip)
             tip = tip.estimate
+
+        self._notify('on_estimates_finalized', newly_finalized)
+
+        return self.last_finalized_block
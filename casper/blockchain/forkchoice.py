@@ -14,9 +14,8 @@ def get_max_weight_indexes(scores):
     return max_weight_estimates
 
 
-def get_fork_choice(last_finalized_block, children, latest_messages):
-    """Returns the estimate by selecting highest weight sub-trees.
-    Starts from the last_finalized_block and stops when it reaches a tip."""
+def get_scores(last_finalized_block, latest_messages):
+    """Returns the weight of the sub-tree rooted at each block after the last_finalized_block."""
 
     scores = dict()
 
@@ -27,6 +26,34 @@ def get_fork_choice(last_finalized_block, children, latest_messages):
             scores[current_block] = scores.get(current_block, 0) + validator.weight
             current_block = current_block.estimate
 
+    return scores
+
+
+def update_scores(scores, supporters, old_block, new_block, weight):
+    """Moves some weight from the branch ending at old_block to the branch ending at new_block.
+    Only the blocks between the two branches' common ancestor and their tips are touched.
+    supporters counts the latest messages below each block, so that a block left without
+    any support is dropped rather than left with a floating point remainder."""
+
+    while old_block != new_block:
+        if old_block is None or (new_block is not None and new_block.height >= old_block.height):
+            scores[new_block] = scores.get(new_block, 0) + weight
+            supporters[new_block] = supporters.get(new_block, 0) + 1
+            new_block = new_block.estimate
+        else:
+            supporters[old_block] -= 1
+            if supporters[old_block] == 0:
+                del supporters[old_block]
+                del scores[old_block]
+            else:
+                scores[old_block] -= weight
+            old_block = old_block.estimate
+
+
+def get_fork_choice_from_scores(last_finalized_block, children, scores):
+    """Returns the estimate by selecting highest weight sub-trees, given sub-tree weights.
+    Starts from the last_finalized_block and stops when it reaches a tip."""
+
     best_block = last_finalized_block
     while best_block in children:
         curr_scores = dict()
@@ -47,3 +74,12 @@ def get_fork_choice(last_finalized_block, children, latest_messages):
         best_block = max_weight_children.pop()
 
     return best_block
+
+
+def get_fork_choice(last_finalized_block, children, latest_messages):
+    """Returns the estimate by selecting highest weight sub-trees.
+    Starts from the last_finalized_block and stops when it reaches a tip."""
+
+    scores = get_scores(last_finalized_block, latest_messages)
+
+    return get_fork_choice_from_scores(last_finalized_block, children, scores)
@@ -0,0 +1,155 @@
+"""The safety sweep module runs the clique oracle over a whole chain at once"""
+import bisect
+
+from casper.safety_oracles.clique_oracle import get_fault_tolerance
+import casper.safety_oracles.weighted_clique as weighted_clique
+
+
+class SafetySweep(object):
+    """Checks clique oracle safety on every block of the chain ending at some tip.
+
+    A message agrees with each block on the chain up to the height of its common ancestor
+    with the tip. So whether a validator is on a block, and whether two validators' edge
+    in the clique oracle exists for it, both hold for exactly the blocks up to some height.
+    These heights are found once for the whole chain, and safety only changes at them.
+    As safety is monotone down the chain, the deepest safe block is found by binary search."""
+
+    def __init__(self, tip, view, validator_set):
+        self.tip = tip
+        self.view = view
+        self.validator_set = validator_set
+
+        self._agreement_heights = dict()
+        self._suffix_minimums = dict()
+
+        # The highest block each validator's latest message is on.
+        self.with_candidate_heights = {
+            validator: self._agreement_height(view.latest_messages[validator])
+            for validator in validator_set if validator in view.latest_messages
+        }
+
+        # The highest block each pair of validators has an edge for.
+        self.edge_heights = dict()
+        validators = list(self.with_candidate_heights)
+        for i, val1 in enumerate(validators):
+            for val2 in validators[i + 1:]:
+                height = self._edge_height(val1, val2)
+                if height > 0:
+                    self.edge_heights[(val1, val2)] = height
+
+        # The graph is the same for all the heights between consecutive thresholds.
+        self.thresholds = sorted(
+            set(self.with_candidate_heights.values()) | set(self.edge_heights.values())
+        )
+        self._results = dict()
+
+    def _agreement_height(self, message):
+        """Returns the height of the highest block on the chain that message agrees with."""
+        if message not in self._agreement_heights:
+            common_ancestor = self.tip.get_common_ancestor(message)
+            self._agreement_heights[message] = common_ancestor.height if common_ancestor else 0
+
+        return self._agreement_heights[message]
+
+    def _free_message_height(self, validator, sequence_number):
+        """Returns the height of the highest block a message from validator, with at least
+        some sequence number, would be free (i.e. conflicting) for."""
+        messages = self.view.messages_by_sender[validator]
+        suffix_minimums = self._suffix_minimums.setdefault(validator, [])
+
+        # suffix_minimums[i] is the minimum agreement height of the latest i + 1 messages
+        while len(suffix_minimums) < len(messages) - sequence_number:
+            height = self._agreement_height(messages[-len(suffix_minimums) - 1])
+            if suffix_minimums:
+                height = min(height, suffix_minimums[-1])
+            suffix_minimums.append(height)
+
+        return suffix_minimums[len(messages) - sequence_number - 1]
+
+    def _edge_height(self, val1, val2):
+        """Returns the height of the highest block val1 and val2 have an edge for."""
+        v1_msg = self.view.latest_messages[val1]
+        v2_msg = self.view.latest_messages[val2]
+        if val2 not in v1_msg.justification.latest_messages or \
+                val1 not in v2_msg.justification.latest_messages:
+            return 0
+
+        v2_msg_in_v1_view = v1_msg.justification.latest_messages[val2]
+        v1_msg_in_v2_view = v2_msg.justification.latest_messages[val1]
+
+        return min(
+            self.with_candidate_heights[val1],
+            self.with_candidate_heights[val2],
+            self._agreement_height(v2_msg_in_v1_view),
+            self._agreement_height(v1_msg_in_v2_view),
+            self._free_message_height(val2, v2_msg_in_v1_view.sequence_number),
+            self._free_message_height(val1, v1_msg_in_v2_view.sequence_number)
+        )
+
+    def check_height(self, height):
+        """Returns the (fault_tolerance, num_node_ft) of the block on the chain at height."""
+        index = bisect.bisect_left(self.thresholds, height)
+        if index == len(self.thresholds):
+            return 0, 0
+
+        threshold = self.thresholds[index]
+        if threshold not in self._results:
+            self._results[threshold] = self._check_threshold(threshold)
+
+        return self._results[threshold]
+
+    def _check_threshold(self, threshold):
+        with_candidate = {
+            validator for validator in self.with_candidate_heights
+            if self.with_candidate_heights[validator] >= threshold
+        }
+
+        # Do not have safety if less than half have candidate_estimate.
+        if self.validator_set.weight(with_candidate) < self.validator_set.weight() / 2:
+            return 0, 0
+
+        edges = [edge for edge in self.edge_heights if self.edge_heights[edge] >= threshold]
+        weights = {validator: validator.weight for edge in edges for validator in edge}
+        biggest_clique, _ = weighted_clique.find_max_weight_clique(weights, edges)
+
+        return get_fault_tolerance(
+            biggest_clique,
+            self.validator_set.weight(biggest_clique),
+            self.validator_set
+        )
+
+    def check_block(self, block):
+        """Returns the (fault_tolerance, num_node_ft) of a block on the chain."""
+        assert block.is_in_blockchain(self.tip), "...expected a block on the chain"
+        return self.check_height(block.height)
+
+    def deepest_safe_block(self, base=None):
+        """Returns the highest safe block on the chain above base, or None if there is none."""
+        low = base.height + 1 if base else 1
+        high = self.tip.height
+
+        if low > high or self.check_height(low)[0] <= 0:
+            return None
+
+        # safety holds for all of [low, safe_height]
+        safe_height = low
+        while safe_height < high:
+            middle = (safe_height + high + 1) // 2
+            if self.check_height(middle)[0] > 0:
+                safe_height = middle
+            else:
+                high = middle - 1
+
+        return self.tip.get_ancestor_at_height(safe_height)
+
+    def fault_tolerances(self, base=None):
+        """Returns a map from each block on the chain above base to its
+        (fault_tolerance, num_node_ft)."""
+        fault_tolerances = dict()
+
+        block = self.tip
+        while block and block != base:
+            fault_tolerances[block] = self.check_height(block.height)
+            block = block.estimate
+
+        return fault_tolerances
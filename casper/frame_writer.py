@@ -0,0 +1,83 @@
+"""The frame writer module streams rendered viewgraphs into a GIF"""
+from io import BytesIO
+import multiprocessing
+import queue
+
+THUMBNAIL_SIZE = (1000, 1000)
+FRAME_DURATION = 0.4
+# Frames waiting for a background writer. When full, rendering waits for the writer,
+# so memory stays bounded however many frames are saved.
+FRAME_QUEUE_SIZE = 4
+# How long to wait for room in the queue before checking the worker is still running.
+FRAME_QUEUE_TIMEOUT = 1
+
+
+class GifWriter(object):
+    """Thumbnails PNG frames and appends them to a GIF as they are added"""
+
+    def __init__(self, path, size=THUMBNAIL_SIZE, frame_duration=FRAME_DURATION):
+        import imageio as io
+
+        self.path = path
+        self.size = size
+        self.writer = io.get_writer(path, mode='I', duration=frame_duration)
+        self.frame_count = 0
+
+    def add_frame(self, png):
+        """Appends a frame, given as the bytes of a PNG image, to the GIF."""
+        import numpy as np
+        from PIL import Image
+
+        image = Image.open(BytesIO(png))
+        image.thumbnail(self.size, Image.LANCZOS)
+        self.writer.append_data(np.asarray(image.convert('RGB')))
+        self.frame_count += 1
+
+    def close(self):
+        """Finishes writing the GIF."""
+        self.writer.close()
+
+
+def _write_frames(frames, path, size, frame_duration):
+    writer = GifWriter(path, size, frame_duration)
+    for png in iter(frames.get, None):
+        writer.add_frame(png)
+    writer.close()
+
+
+class BackgroundGifWriter(object):
+    """A GifWriter that thumbnails and encodes frames in a worker process,
+    while the next frames are rendered"""
+
+    def __init__(self, path, size=THUMBNAIL_SIZE, frame_duration=FRAME_DURATION):
+        self.path = path
+        self.frames = multiprocessing.Queue(FRAME_QUEUE_SIZE)
+        self.process = multiprocessing.Process(
+            target=_write_frames,
+            args=(self.frames, path, size, frame_duration)
+        )
+        self.process.start()
+        self.frame_count = 0
+
+    def add_frame(self, png):
+        """Sends a frame, given as the bytes of a PNG image, to the worker."""
+        self._put(png)
+        self.frame_count += 1
+
+    def _put(self, item):
+        # if the worker has died, the queue is never drained, so fail rather than wait
+        while True:
+            try:
+                self.frames.put(item, timeout=FRAME_QUEUE_TIMEOUT)
+                return
+            except queue.Full:
+                if not self.process.is_alive():
+                    raise Exception("...failed to write " + self.path)
+
+    def close(self):
+        """Waits for the worker to finish writing the GIF."""
+        self._put(None)
+        self.process.join()
+
+        if self.process.exitcode != 0:
+            raise Exception("...failed to write " + self.path)
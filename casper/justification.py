@@ -1,4 +1,84 @@
 """The justification module ..."""
+from collections.abc import Mapping
+import math
+
+
+class PersistentMap(Mapping):
+    """An immutable map that shares unchanged entries with the maps derived from it.
+    Entries are spread over about sqrt(len) buckets by hash, so deriving a new map with
+    one changed entry copies only the bucket index and a single bucket."""
+
+    __slots__ = ('_buckets', '_mask', '_len')
+
+    def __init__(self, items=None):
+        items = dict(items) if items else {}
+
+        width = self._width_for(len(items))
+        buckets = [dict() for _ in range(width)]
+        for key in items:
+            buckets[hash(key) & (width - 1)][key] = items[key]
+
+        self._buckets = tuple(buckets)
+        self._mask = width - 1
+        self._len = len(items)
+
+    @staticmethod
+    def _width_for(size):
+        """Returns the number of buckets to use for some number of entries."""
+        return 1 << max(1, math.ceil(math.log2(max(size, 1)) / 2))
+
+    def __getitem__(self, key):
+        return self._buckets[hash(key) & self._mask][key]
+
+    def __contains__(self, key):
+        return key in self._buckets[hash(key) & self._mask]
+
+    def get(self, key, default=None):
+        return self._buckets[hash(key) & self._mask].get(key, default)
+
+    def __iter__(self):
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return "PersistentMap({})".format(dict(self))
+
+    def set(self, key, value):
+        """Returns a new map with key set to value."""
+        return self.update({key: value})
+
+    def update(self, items):
+        """Returns a new map with all of the passed items set."""
+        if not items:
+            return self
+
+        changed = dict()
+        size = self._len
+        for key in items:
+            index = hash(key) & self._mask
+            if index not in changed:
+                changed[index] = dict(self._buckets[index])
+            if key not in changed[index]:
+                size += 1
+            changed[index][key] = items[key]
+
+        if self._width_for(size) != len(self._buckets):
+            merged = dict(self)
+            merged.update(items)
+            return PersistentMap(merged)
+
+        buckets = list(self._buckets)
+        for index in changed:
+            buckets[index] = changed[index]
+
+        new_map = PersistentMap.__new__(PersistentMap)
+        new_map._buckets = tuple(buckets)
+        new_map._mask = self._mask
+        new_map._len = size
+        return new_map
 
 
 class Justification(object):
@@ -6,6 +86,9 @@ class Justification(object):
     def __init__(self, latest_messages=None):
         if latest_messages is None:
             latest_messages = {}
-        self.latest_messages = dict()
-        for validator in latest_messages:
-            self.latest_messages[validator] = latest_messages[validator]
+
+        # Maps are shared, rather than copied, between the justifications of messages
+        if not isinstance(latest_messages, PersistentMap):
+            latest_messages = PersistentMap(latest_messages)
+
+        self.latest_messages = latest_messages
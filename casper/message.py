@@ -1,14 +1,28 @@
 """The message module defines an abstract message class  """
-import random as r
+import itertools
+
 from casper.justification import Justification
 
 
 class Message(object):
     """Message/bet data structure for blockchain consensus"""
+
+    __slots__ = (
+        'sender',
+        'estimate',
+        'justification',
+        'sequence_number',
+        'id',
+        '_display_height'
+    )
+
+    # Every message gets a distinct integer id, used for hashing and equality
+    _ids = itertools.count()
+
     def __eq__(self, message):
-        if message is None:
+        if not isinstance(message, Message):
             return False
-        return self.__hash__() == message.__hash__()
+        return self.id == message.id
 
     def __ne__(self, message):
         return not self.__eq__(message)
@@ -26,20 +40,36 @@ class Message(object):
         else:
             self.sequence_number = 0
 
-        # The "display_height" of bets are used for visualization of views
-        if not any(self.justification.latest_messages):
-            self.display_height = 0
-        else:
-            max_height = max(
-                self.justification.latest_messages[validator].display_height
-                for validator in self.justification.latest_messages
-            )
-            self.display_height = max_height + 1
+        # Only needed to plot views, so display_height is computed when first used
+        self._display_height = None
 
-        self.salt = r.randint(0, 1000000)
+        self.id = next(Message._ids)
 
     def __hash__(self):
-        return hash(str(self.sender.name) + str(self.sequence_number) + str(self.salt))
+        return self.id
+
+    @property
+    def display_height(self):
+        """The "display_height" of bets are used for visualization of views.
+        It is one more than the highest display_height in the justification."""
+        if self._display_height is None:
+            self._compute_display_heights()
+        return self._display_height
+
+    def _compute_display_heights(self):
+        # Uses an explicit stack, as justifications can be much deeper than the recursion limit
+        stack = [self]
+        while stack:
+            message = stack[-1]
+            justified = message.justification.latest_messages.values()
+
+            unknown = [m for m in justified if m._display_height is None]
+            if unknown:
+                stack.extend(unknown)
+                continue
+
+            stack.pop()
+            message._display_height = max((m._display_height for m in justified), default=-1) + 1
 
     def conflicts_with(self, message):
         '''Must be implemented by child class'''
@@ -16,6 +16,20 @@ class Network(object):
 
         validator.receive_messages(set([message]))
 
+    def propagate_messages_to_validators(self, deliveries):
+        """Propagate many (message, validator) deliveries.
+        Each validator receives all of its messages in a single batch."""
+        batches = dict()
+        for message, validator in deliveries:
+            assert message in self.global_view.messages, ("...expected only to propagate "
+                                                          "messages from the global view")
+            assert validator in self.validator_set, "...expected a known validator"
+
+            batches.setdefault(validator, set()).add(message)
+
+        for validator in batches:
+            validator.receive_messages(batches[validator])
+
     def get_message_from_validator(self, validator):
         """Get a message from a validator."""
         assert validator in self.validator_set, "...expected a known validator"
@@ -39,6 +53,6 @@ class Network(object):
 
     def random_initialization(self):
         """Generates starting messages for all validators with None as an estiamte."""
-        for validator in self.validator_set:
+        for validator in self.validator_set.sorted_by_name():
             new_bet = self.get_message_from_validator(validator)
             self.global_view.add_messages(set([new_bet]))
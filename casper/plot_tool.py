@@ -1,37 +1,59 @@
-"""The plot tool module contains a base plot tool for displaying viewgraphs """
+"""The plot tool module contains a base plot tool for displaying viewgraphs.
+Plotting libraries are imported when a viewgraph is first built, not on import,
+so headless runs neither pay for them nor need Tk."""
 
+from io import BytesIO
 from math import pi
 import os
-import matplotlib as mpl
-import imageio as io
-from PIL import Image
-import networkx as nx
+import sys
 
-mpl.use('TkAgg')
-import matplotlib.pyplot as plt  # noqa
-import pylab  # noqa
+from casper.frame_writer import BackgroundGifWriter, GifWriter
+import casper.utils as utils
 
 
 BASE = 10000000
-IMAGE_LIMIT = 500
 FRAMES = "graphs/"
-THUMBNAILS = "thumbs/"
+GIF_NAME = "mygif.gif"
 COLOURS = ["LightYellow", "Yellow", "Orange", "OrangeRed", "Red", "DarkRed", "Black"]
 
 
+def _pyplot(display):
+    """Returns pyplot, choosing an interactive backend only if plots are displayed."""
+    import matplotlib as mpl
+
+    if 'matplotlib.pyplot' not in sys.modules:
+        mpl.use('TkAgg' if display else 'Agg')
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
 class PlotTool(object):
     """A base object with functions for building, displaying, and saving viewgraphs"""
 
-    def __init__(self, display, save, node_shape):
+    def __init__(self, display, save, node_shape, background_save=False, window=None):
         self.display = display
         self.save = save
         self.node_shape = node_shape
 
+        # With a window, only messages within that many display heights of the
+        # highest latest message are drawn, so each viewgraph costs the same to draw.
+        self.window = window
+
+        # Saved viewgraphs are streamed into a GIF as they are rendered,
+        # and with background_save, encoded in a separate process.
+        self.background_save = background_save
+        self.gif_writer = None
+
         if save:
             self._create_graph_folder()
 
         self.report_number = 0
 
+        # The viewgraph is drawn on one figure, kept between reports. Messages and
+        # edges are added to it as they appear, and positions are computed once.
+        self.figure = None
+        self._positions = dict()
 
     def _create_graph_folder(self):
         graph_path = os.path.dirname(os.path.abspath(__file__)) + '/../graphs/'
@@ -49,87 +71,285 @@ class PlotTool(object):
                 break
 
         self.graph_path = new_plot + "/"
-        self.thumbnail_path = self.graph_path + "thumbnails/"
-        os.makedirs(self.thumbnail_path)
-
-    def build_viewgraph(self, view, validator_set, message_colors, message_labels, edges):
-        """Creates and displays view graphs."""
-
-        graph = nx.Graph()
-
-        nodes = view.messages
 
-        fig_size = plt.rcParams["figure.figsize"]
-        fig_size[0] = 20
-        fig_size[1] = 20
-        plt.rcParams["figure.figsize"] = fig_size
-
-        for message in nodes:
-            graph.add_edges_from([(message, message)])
-
-        edge = []
-        if edges == []:
-            for message in nodes:
-                for msg_in_justification in message.justification.latest_messages.values():
-                    if msg_in_justification is not None:
-                        edge.append((msg_in_justification, message))
-
-            edges = [{'edges': edge, 'width': 3, 'edge_color': 'black', 'style': 'solid'}]
-
-        positions = dict()
-
-        sorted_validators = validator_set.sorted_by_name()
-        for message in nodes:
-            # Index of val in list may have some small performance concerns.
-            positions[message] = (float)(sorted_validators.index(message.sender) + 1) / \
-                                 (float)(len(validator_set) + 1), 0.2 + 0.1*message.display_height
+    def _reset_figure(self, plt, validator_set):
+        """Starts a new figure, to which all messages in the view are added again."""
+        self.figure = plt.figure(figsize=(20, 20))
+        self.axes = self.figure.gca()
+        self.axes.tick_params(
+            axis='both', which='both',
+            bottom=False, left=False, labelbottom=False, labelleft=False
+        )
+
+        self._node_batches = []
+        self._node_locations = dict()
+        self._node_colors = dict()
+        self._label_texts = dict()
+        self._batch_sizes = []
+        self._edge_groups = []
+        self._justification_edges = []
+        self._max_y = 0.2
+
+        self._columns = {
+            validator: i + 1 for i, validator in enumerate(validator_set.sorted_by_name())
+        }
+        # weights stay at the bottom of the axes, however the view is scrolled
+        bottom = self.axes.get_xaxis_transform()
+        self.axes.text(-0.05, 0.02, "Weights: ", fontsize=20, transform=bottom)
+        for validator, column in self._columns.items():
+            xpos = column / (len(validator_set) + 1) - 0.01
+            self.axes.text(xpos, 0.02, str(int(validator.weight)), fontsize=20, transform=bottom)
+
+    def window_bottom(self, view):
+        """Returns the lowest display height in the window, or None if there is no window."""
+        if self.window is None or not view.latest_messages:
+            return None
+
+        top = max(message.display_height for message in view.latest_messages.values())
+        return top - self.window
+
+    def _pinned_messages(self, view):
+        """Returns messages drawn even when they are below the window."""
+        return set()
+
+    def visible_messages(self, view):
+        """Returns the messages to draw: all of them, or those in the window."""
+        bottom = self.window_bottom(view)
+        if bottom is None:
+            return view.messages
+
+        # Display heights grow with sequence number, so the messages of each validator in
+        # the window are its latest ones.
+        messages = self._pinned_messages(view)
+        for sender_messages in view.messages_by_sender.values():
+            for message in reversed(sender_messages):
+                if message.display_height < bottom:
+                    break
+                messages.add(message)
+
+        return messages
+
+    def in_window(self, edges, view):
+        """Returns the edges with an end at or above the bottom of the window. As the window
+        only moves up, edges to plot can be pruned with this as the window moves."""
+        bottom = self.window_bottom(view)
+        if bottom is None:
+            return edges
+
+        return [
+            edge for edge in edges
+            if max(message.display_height for message in edge) >= bottom
+        ]
+
+    def entries_in_window(self, entries, view):
+        """Returns the entries of a dict keyed by message, such as colours or labels,
+        for the messages to draw, so such dicts can be pruned as the window moves."""
+        if self.window is None:
+            return entries
+
+        messages = self.visible_messages(view)
+        return {message: value for message, value in entries.items() if message in messages}
+
+    def _position(self, message):
+        if message not in self._positions:
+            self._positions[message] = (
+                self._columns[message.sender] / (len(self._columns) + 1),
+                0.2 + 0.1 * message.display_height
+            )
 
-        node_color_map = {}
-        for message in nodes:
-            if message not in message_colors:
-                node_color_map[message] = 'white'
-            elif message_colors[message] == len(validator_set) - 1:
-                node_color_map[message] = "Black"
+        return self._positions[message]
+
+    def _node_color(self, message, message_colors, num_validators):
+        if message not in message_colors:
+            return 'white'
+        if message_colors[message] == num_validators - 1:
+            return "Black"
+
+        return COLOURS[int(len(COLOURS) * message_colors[message] / num_validators)]
+
+    def _add_nodes(self, messages, message_colors, message_labels, num_validators):
+        """Draws new messages as one batch of nodes, with their labels. The batch takes
+        the slot of a removed batch if there is one, so windowed runs keep few slots."""
+        positions = [self._position(message) for message in messages]
+        colors = [
+            self._node_color(message, message_colors, num_validators) for message in messages
+        ]
+
+        batch = self.axes.scatter(
+            [x for x, _ in positions],
+            [y for _, y in positions],
+            s=[350 * pow(message.sender.weight / pi, 0.5) for message in messages],
+            c=colors,
+            marker=self.node_shape,
+            alpha=0.5,
+            edgecolors='black',
+            zorder=2
+        )
+
+        if None in self._node_batches:
+            slot = self._node_batches.index(None)
+            self._node_batches[slot] = batch
+            self._batch_sizes[slot] = len(messages)
+        else:
+            slot = len(self._node_batches)
+            self._node_batches.append(batch)
+            self._batch_sizes.append(len(messages))
+
+        for i, message in enumerate(messages):
+            self._node_locations[message] = (slot, i)
+            self._node_colors[message] = colors[i]
+            self._label_texts[message] = self.axes.text(
+                positions[i][0], positions[i][1], str(message_labels.get(message, '')),
+                horizontalalignment='center', verticalalignment='center', zorder=3
+            )
+            self._max_y = max(self._max_y, positions[i][1])
+
+            # with a window, justification edges are recomputed from the drawn messages
+            if self.window is None:
+                for justified in message.justification.latest_messages.values():
+                    self._justification_edges.append((justified, message))
+
+    def _remove_nodes(self, messages):
+        """Hides messages that have left the window, and removes batches of nodes
+        once none of their messages are left."""
+        hidden = dict()
+        for message in messages:
+            batch, i = self._node_locations.pop(message)
+            if batch not in hidden:
+                hidden[batch] = self._node_batches[batch].get_sizes().copy()
+            hidden[batch][i] = 0
+            self._batch_sizes[batch] -= 1
+
+            del self._node_colors[message]
+            self._label_texts.pop(message).remove()
+            self._positions.pop(message, None)
+
+        for batch, sizes in hidden.items():
+            if self._batch_sizes[batch] == 0:
+                self._node_batches[batch].remove()
+                self._node_batches[batch] = None
             else:
-                node_color_map[message] = COLOURS[int(len(COLOURS) * message_colors[message] / \
-                                          len(validator_set))]
-
-
-        color_values = [node_color_map.get(node) for node in nodes]
-
-        labels = {}
-
-        node_sizes = []
-        for message in nodes:
-            node_sizes.append(350 * pow(message.sender.weight / pi, 0.5))
-            labels[message] = message_labels.get(message, '')
-
-        nx.draw_networkx_nodes(graph, positions, alpha=0.5, node_color=color_values, nodelist=nodes,
-                               node_size=node_sizes, node_shape=self.node_shape, edge_color='black')
-
-        for edge in edges:
-            if isinstance(edge, dict):
-                nx.draw_networkx_edges(
-                    graph,
-                    positions,
-                    edgelist=(edge['edges']),
-                    width=edge['width'],
-                    edge_color=edge['edge_color'],
-                    style=edge['style'],
-                    alpha=0.5
-                )
+                self._node_batches[batch].set_sizes(sizes)
+
+    def _restyle_nodes(self, message_colors, message_labels, num_validators):
+        """Recolours and relabels only the messages whose colour or label changed."""
+        changed_batches = dict()
+        for message in self._node_locations:
+            color = self._node_color(message, message_colors, num_validators)
+            if color != self._node_colors[message]:
+                batch, i = self._node_locations[message]
+                if batch not in changed_batches:
+                    changed_batches[batch] = self._node_batches[batch].get_facecolors()
+                changed_batches[batch][i] = self._to_rgba(color)
+                self._node_colors[message] = color
+
+        for batch, facecolors in changed_batches.items():
+            self._node_batches[batch].set_facecolors(facecolors)
+
+        for message, text in self._label_texts.items():
+            label = str(message_labels.get(message, ''))
+            if text.get_text() != label:
+                text.set_text(label)
+
+    @staticmethod
+    def _to_rgba(color):
+        import matplotlib.colors as colors
+        return colors.to_rgba(color, alpha=0.5)
+
+    def _segments(self, edges):
+        return [
+            (self._positions[start], self._positions[end]) for start, end in edges
+            if start in self._positions and end in self._positions
+        ]
+
+    def _update_edges(self, edges):
+        """Draws edges added to each edge list since the last viewgraph.
+        Edge lists that are not extended from the last viewgraph are drawn again."""
+        from matplotlib.collections import LineCollection
+
+        for i, edge in enumerate(edges):
+            assert isinstance(edge, dict), edge
+
+            if i < len(self._edge_groups):
+                edge_list, drawn, collections = self._edge_groups[i]
+                if edge_list is not edge['edges'] or len(edge_list) < drawn:
+                    for collection in collections:
+                        collection.remove()
+                    drawn, collections = 0, []
             else:
-                assert False, edge
-        nx.draw_networkx_labels(graph, positions, labels=labels)
+                drawn, collections = 0, []
+
+            new_edges = edge['edges'][drawn:]
+            if new_edges:
+                collection = LineCollection(
+                    self._segments(new_edges),
+                    linewidths=edge['width'],
+                    colors=edge['edge_color'],
+                    linestyles=edge['style'],
+                    alpha=0.5,
+                    zorder=1
+                )
+                self.axes.add_collection(collection)
+                collections.append(collection)
 
-        ax = plt.gca()
-        ax.collections[0].set_edgecolor("black")
-        ax.text(-0.05, 0.1, "Weights: ", fontsize=20)
+            group = (edge['edges'], len(edge['edges']), collections)
+            if i < len(self._edge_groups):
+                self._edge_groups[i] = group
+            else:
+                self._edge_groups.append(group)
 
-        for validator in validator_set:
-            xpos = (float)(validator.name + 1)/(float)(len(validator_set) + 1) - 0.01
-            ax.text(xpos, 0.1, (str)((int)(validator.weight)), fontsize=20)
+        for _, _, collections in self._edge_groups[len(edges):]:
+            for collection in collections:
+                collection.remove()
+        del self._edge_groups[len(edges):]
 
+    def build_viewgraph(self, view, validator_set, message_colors, message_labels, edges):
+        """Updates the viewgraph figure with the messages and edges added since it was
+        last built, and the messages whose colours or labels changed."""
+        plt = _pyplot(self.display)
+
+        if self.figure is None or not plt.fignum_exists(self.figure.number):
+            self._reset_figure(plt, validator_set)
+
+        messages = self.visible_messages(view)
+        if self.window is not None:
+            self._remove_nodes([
+                message for message in self._node_locations if message not in messages
+            ])
+
+        num_validators = len(validator_set)
+        self._restyle_nodes(message_colors, message_labels, num_validators)
+
+        new_messages = [message for message in messages if message not in self._node_locations]
+        if new_messages:
+            self._add_nodes(new_messages, message_colors, message_labels, num_validators)
+
+        if self.window is None:
+            if edges == []:
+                edges = [utils.edge(self._justification_edges, 3, 'black', 'solid')]
+        else:
+            if edges == []:
+                edges = [utils.edge(
+                    [(justified, message) for message in messages
+                     for justified in message.justification.latest_messages.values()],
+                    3, 'black', 'solid'
+                )]
+            # only edges between drawn messages are drawn, so each is drawn again
+            edges = [
+                dict(edge, edges=[
+                    (start, end) for start, end in edge['edges']
+                    if start in self._node_locations and end in self._node_locations
+                ])
+                for edge in edges
+            ]
+        self._update_edges(edges)
+
+        self.axes.set_xlim(-0.1, 1.0)
+        if self.window is None:
+            self.axes.set_ylim(0.05, self._max_y + 0.1)
+        else:
+            heights = [self._positions[message][1] for message in self._node_locations]
+            self.axes.set_ylim(min(heights, default=0.2) - 0.15, max(heights, default=0.2) + 0.1)
 
     def next_viewgraph(
             self,
@@ -148,72 +368,58 @@ class PlotTool(object):
             edges = []
 
         self.report_number += 1
+        plt = _pyplot(self.display)
 
-        # TODO: if we save and plot the graph, we currently build it twice
-        # issues as pyplot clears the graph otherwise, should try to fix this
-        if self.save:
-            self.build_viewgraph(
-                view,
-                validator_set,
-                message_colors=message_colors,
-                message_labels=message_labels,
-                edges=edges
-            )
+        # the same figure is saved and displayed, so it is only built once
+        self.build_viewgraph(
+            view,
+            validator_set,
+            message_colors=message_colors,
+            message_labels=message_labels,
+            edges=edges
+        )
 
-            plt.savefig(self.graph_path + '/' + str(1000 + self.report_number) + ".png")
-            plt.close('all')
+        if self.save:
+            self._save_frame(self.figure)
 
         if self.display:
-            self.build_viewgraph(
-                view,
-                validator_set,
-                message_colors=message_colors,
-                message_labels=message_labels,
-                edges=edges
-            )
-
             plt.show()
 
-    def make_thumbnails(self, frame_count_limit=IMAGE_LIMIT, xsize=1000, ysize=1000):
-        """Make thumbnail images in PNG format."""
-
-        file_names = sorted([fn for fn in os.listdir(self.graph_path) if fn.endswith('.png')])
+    def _save_frame(self, figure):
+        """Renders a figure to memory and adds it to the GIF."""
+        if self.gif_writer is None:
+            writer_class = BackgroundGifWriter if self.background_save else GifWriter
+            self.gif_writer = writer_class(self.graph_path + GIF_NAME)
 
-        if len(file_names) >= frame_count_limit:
-            raise Exception("To many frames!")
+        frame = BytesIO()
+        figure.savefig(frame, format='png')
+        self.gif_writer.add_frame(frame.getvalue())
 
-        images = []
-        for file_name in file_names:
-            images.append(Image.open(self.graph_path + file_name))
+    def make_gif(self):
+        """Finishes the GIF visualization of the saved view graphs."""
+        if self.gif_writer is None:
+            return
 
+        self.gif_writer.close()
+        self.gif_writer = None
 
-        size = (xsize, ysize)
-        iterator = 0
-        for image in images:
-            image.thumbnail(size, Image.ANTIALIAS)
-            image.save(self.thumbnail_path + str(1000 + iterator) + "thumbnail.png", "PNG")
-            iterator += 1
 
+class NullPlotTool(object):
+    """A plot tool for headless runs, that keeps no plotting state and draws nothing"""
 
-    def make_gif(self, frame_count_limit=IMAGE_LIMIT, gif_name="mygif.gif", frame_duration=0.4):
-        """Make a GIF visualization of view graph."""
-
-        self.make_thumbnails(frame_count_limit=frame_count_limit)
-
-        file_names = sorted([file_name for file_name in os.listdir(self.thumbnail_path)
-                             if file_name.endswith('thumbnail.png')])
-
-        images = []
-        for file_name in file_names:
-            images.append(Image.open(self.thumbnail_path + file_name))
+    def __init__(self, display=False, save=False, view=None, validator_set=None,
+                 background_save=False):
+        self.display = display
+        self.save = save
+        self.background_save = background_save
+        self.view = view
+        self.validator_set = validator_set
 
-        destination_filename = self.graph_path + gif_name
+    def update(self, message_paths=None, sent_messages=None, new_messages=None):
+        """Ignores new messages and paths"""
 
-        iterator = 0
-        with io.get_writer(destination_filename, mode='I', duration=frame_duration) as writer:
-            for file_name in file_names:
-                image = io.imread(self.thumbnail_path + file_name)
-                writer.append_data(image)
-                iterator += 1
+    def plot(self):
+        """Draws nothing"""
 
-        writer.close()
+    def make_gif(self):
+        """Makes no GIF, as no viewgraphs are saved"""
@@ -0,0 +1,199 @@
+"""The attack engine module ... """
+import heapq
+
+import numpy as np
+
+from casper.safety_oracles.adversary_models.model_bet import ModelBet
+
+
+class AttackEngine(object):
+    """Runs the same ideal network attack as the Adversary, on arrays.
+
+    Each model validator's view is a row of a viewables matrix, and the weight it sees on
+    the victim and target estimates is kept as a tally, updated as validators move to the
+    target estimate. Rather than passing over all validators until no progress is made,
+    only the validators whose view changed are checked again, in the order the passes would."""
+
+    # Tallies closer than this, relative to the total weight, are summed again
+    # in the order the model validator would sum them.
+    NEAR_TIE = 1e-9
+
+    def __init__(self, victim_estimate, latest_estimates, viewables, validator_set):
+        """latest_estimates maps each validator to the estimate of its latest bet, and
+        viewables maps each validator to the estimates of the latest bets it has seen."""
+
+        # Estimate being attacked.
+        self.victim_estimate = victim_estimate
+
+        # Estimate adversary is attack towards.
+        self.target_estimate = 1 - victim_estimate
+
+        self.validator_set = validator_set
+        self.validators = list(validator_set)
+        self.index = {validator: i for i, validator in enumerate(self.validators)}
+        self.weights = np.array([validator.weight for validator in self.validators], dtype=float)
+        self.total_weight = float(np.abs(self.weights).sum())
+
+        size = len(self.validators)
+        # observed[i, j]: validator i has seen a latest bet from validator j,
+        # on_target[i, j]: and that bet is on the target estimate.
+        self.observed = np.zeros((size, size), dtype=bool)
+        self.on_target = np.zeros((size, size), dtype=bool)
+        # The order each validator sums the weights of the bets it has seen in.
+        self.observed_order = []
+        for i, validator in enumerate(self.validators):
+            order = [self.index[val2] for val2 in viewables[validator]]
+            self.observed_order.append(order)
+            self.observed[i, order] = True
+            self.on_target[i, order] = [
+                estimate == self.target_estimate for estimate in viewables[validator].values()
+            ]
+
+        self.target_weight = np.dot(self.on_target, self.weights)
+        self.victim_weight = np.dot(self.observed & ~self.on_target, self.weights)
+
+        self.latest_on_target = np.array([
+            latest_estimates[validator] == self.target_estimate for validator in self.validators
+        ], dtype=bool)
+
+        # The attacker adds the bets they created in the attack to this view.
+        self.attack_view = set()
+
+        self.voting_against_attacker = set()
+        self.voting_with_attacker = set()
+        for validator in validator_set:
+            if self._make_new_latest_bet(self.index[validator]):
+                self.voting_with_attacker.add(validator)
+            else:
+                self.voting_against_attacker.add(validator)
+
+        # The attacker tracks the weights of the victim and target estimates:
+        self.weight_of_victim_estimate = sum(
+            validator.weight
+            for validator in self.voting_against_attacker
+        )
+        self.weight_of_target_estimate = sum(
+            validator.weight
+            for validator in self.voting_with_attacker
+        )
+
+        # The attacker produces a log of the bets added during the attack.
+        self.operations_log = []
+
+    def _exact_weights(self, i):
+        """Returns the target and victim weight validator i sees, summed as the
+        model validator sums them."""
+        target_weight = sum(
+            self.validators[j].weight for j in self.observed_order[i] if self.on_target[i, j]
+        )
+        victim_weight = sum(
+            self.validators[j].weight for j in self.observed_order[i] if not self.on_target[i, j]
+        )
+
+        return target_weight, victim_weight
+
+    def _estimate_is_target(self, i):
+        """Returns True if the estimate of validator i is the target estimate."""
+        target_weight, victim_weight = self.target_weight[i], self.victim_weight[i]
+
+        if abs(target_weight - victim_weight) <= self.NEAR_TIE * self.total_weight:
+            target_weight, victim_weight = self._exact_weights(i)
+            if target_weight == victim_weight and target_weight != 0:
+                raise RuntimeError("...no two subsets of validators should have same weight")
+
+        # with no weight on either estimate, the model validator defaults to the target
+        return target_weight >= victim_weight
+
+    def _make_new_latest_bet(self, i):
+        """Attempts to move the latest bet of validator i to the target estimate."""
+        if not self.latest_on_target[i] and self._estimate_is_target(i):
+            self.latest_on_target[i] = True
+
+        return self.latest_on_target[i]
+
+    def _show(self, rows, j):
+        """Makes the bet of validator j on the target estimate viewable to validators in rows."""
+        already_observed = self.observed[rows, j]
+        for i in rows[~already_observed]:
+            self.observed_order[i].append(j)
+
+        self.victim_weight[rows[already_observed]] -= self.weights[j]
+        self.target_weight[rows] += self.weights[j]
+        self.observed[rows, j] = True
+        self.on_target[rows, j] = True
+
+    def _changed_by(self, remaining, j):
+        """Returns the remaining validators that have not seen validator j on the target."""
+        return np.flatnonzero(remaining & ~(self.observed[:, j] & self.on_target[:, j]))
+
+    def is_attack_complete(self):
+        """Return true if the target has more weight than the victim estimate"""
+        return self.weight_of_target_estimate > self.weight_of_victim_estimate
+
+    def ideal_network_attack(self):
+        """Implements an ideal network attack.
+
+        Returns the triple (was_attack_successful, operation_log, attack_view)."""
+
+        if self.is_attack_complete():
+            return True, self.operations_log, self.attack_view
+
+        # The passes of the attack check validators voting against the attacker in this order.
+        voting_against = [self.index[validator] for validator in self.voting_against_attacker]
+        position = {i: p for p, i in enumerate(voting_against)}
+
+        remaining = np.zeros(len(self.validators), dtype=bool)
+        remaining[voting_against] = True
+
+        # First, show all validators not yet on target_estimate
+        # all bets that are on the target_estimate
+        for validator in self.voting_with_attacker:
+            j = self.index[validator]
+            self._show(self._changed_by(remaining, j), j)
+
+        # Each validator voting against is checked in the first pass, and then again in
+        # the first pass that would check it after its view has changed.
+        worklist = [(0, p) for p in range(len(voting_against))]
+        scheduled = set(voting_against)
+
+        while worklist:
+            pass_number, p = heapq.heappop(worklist)
+            i = voting_against[p]
+            scheduled.discard(i)
+
+            if not self._make_new_latest_bet(i):
+                continue
+
+            validator = self.validators[i]
+            remaining[i] = False
+            self.voting_against_attacker.discard(validator)
+
+            self.weight_of_victim_estimate -= validator.weight
+            self.weight_of_target_estimate += validator.weight
+
+            new_bet = ModelBet(self.target_estimate, validator)
+            # Add a log of our operations.
+            self.operations_log.append([
+                "added valid bet for a validator voting against the attacker",
+                hash(new_bet)
+            ])
+            # Update the attack view.
+            self.attack_view.add(new_bet)
+
+            # If attack is complete, stop attacking!
+            if self.is_attack_complete():
+                return True, self.operations_log, self.attack_view
+
+            # Show other validators this new bet on target_estimate.
+            changed = self._changed_by(remaining, i)
+            self._show(changed, i)
+
+            for k in changed:
+                if k in scheduled:
+                    continue
+
+                q = position[k]
+                heapq.heappush(worklist, (pass_number if q > p else pass_number + 1, q))
+                scheduled.add(k)
+
+        return False, self.operations_log, self.attack_view
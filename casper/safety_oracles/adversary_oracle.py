@@ -1,6 +1,6 @@
 """The adversary oracle module ... """
 from casper.safety_oracles.adversary_models.model_bet import ModelBet
-from casper.safety_oracles.adversary_models.adversary import Adversary
+from casper.safety_oracles.adversary_models.attack_engine import AttackEngine
 from casper.safety_oracles.abstract_oracle import AbstractOracle
 import casper.utils as utils
 
@@ -20,28 +20,30 @@ class AdversaryOracle(AbstractOracle):
         self.view = view
         self.validator_set = validator_set
 
-    def get_messages_and_viewables(self):
-        """Converts some current view to binary to make reasoning about viewables easier."""
+    def get_estimates_and_viewables(self):
+        """Converts some current view to binary to make reasoning about viewables easier.
+        Returns the estimate of each validator's latest message, and the estimates of the
+        latest messages each validator has seen."""
 
-        recent_messages = dict()
+        latest_estimates = dict()
         viewables = dict()
 
         # For some validator ...
         for validator in self.validator_set:
             # ... if nothing is seen from validator, assume the worst ...
             if validator not in self.view.latest_messages:
-                recent_messages[validator] = ModelBet(AdversaryOracle.ADV_ESTIMATE, validator)
+                latest_estimates[validator] = AdversaryOracle.ADV_ESTIMATE
                 viewables[validator] = dict()
 
             # If their most recent messages conflicts w/ estimate,
             # again working with adversary.
             elif self.candidate_estimate.conflicts_with(self.view.latest_messages[validator]):
-                recent_messages[validator] = ModelBet(AdversaryOracle.ADV_ESTIMATE, validator)
+                latest_estimates[validator] = AdversaryOracle.ADV_ESTIMATE
                 viewables[validator] = dict()
 
             # Else, they are currently voting on the candidate estimate
             else:
-                recent_messages[validator] = ModelBet(AdversaryOracle.CAN_ESTIMATE, validator)
+                latest_estimates[validator] = AdversaryOracle.CAN_ESTIMATE
 
                 val_latest_message = self.view.latest_messages[validator]
                 # Now, build their viewables
@@ -50,7 +52,7 @@ class AdversaryOracle(AbstractOracle):
                 for val2 in self.validator_set:
                     # if they have seen nothing from some validator, assume the worst
                     if val2 not in val_latest_message.justification.latest_messages:
-                        viewables[validator][val2] = ModelBet(AdversaryOracle.ADV_ESTIMATE, val2)
+                        viewables[validator][val2] = AdversaryOracle.ADV_ESTIMATE
                         continue
 
                     # If they have seen something from other validators, do a free block check
@@ -62,19 +64,38 @@ class AdversaryOracle(AbstractOracle):
                             val2_msg_in_v_view.sequence_number,
                             self.view
                     ):
-                        viewables[validator][val2] = ModelBet(AdversaryOracle.ADV_ESTIMATE, val2)
+                        viewables[validator][val2] = AdversaryOracle.ADV_ESTIMATE
                     else:
-                        viewables[validator][val2] = ModelBet(AdversaryOracle.CAN_ESTIMATE, val2)
+                        viewables[validator][val2] = AdversaryOracle.CAN_ESTIMATE
+
+        return latest_estimates, viewables
+
+    def get_messages_and_viewables(self):
+        """Returns the latest bets and viewables of the view, as model bets."""
+
+        latest_estimates, viewable_estimates = self.get_estimates_and_viewables()
+
+        recent_messages = {
+            validator: ModelBet(estimate, validator)
+            for validator, estimate in latest_estimates.items()
+        }
+        viewables = {
+            validator: {
+                val2: ModelBet(estimate, val2)
+                for val2, estimate in viewable_estimates[validator].items()
+            }
+            for validator in viewable_estimates
+        }
 
         return recent_messages, viewables
 
     def check_estimate_safety(self):
         """Check the safety of the estimate."""
 
-        recent_messages, viewables = self.get_messages_and_viewables()
+        latest_estimates, viewables = self.get_estimates_and_viewables()
 
-        adversary = Adversary(self.CAN_ESTIMATE, recent_messages, viewables, self.validator_set)
-        attack_success, _, _ = adversary.ideal_network_attack()
+        attack = AttackEngine(self.CAN_ESTIMATE, latest_estimates, viewables, self.validator_set)
+        attack_success, _, _ = attack.ideal_network_attack()
 
         if attack_success:
             return 0, 0
@@ -0,0 +1,185 @@
+"""The agreement graph module ... """
+from collections import OrderedDict
+
+import numpy as np
+
+import casper.utils as utils
+
+
+def validators_agree(candidate_estimate, val1, val2, view):
+    """Returns True if val1 and val2 have each seen the other on the candidate_estimate,
+    and there is no later message from either that might change the other's estimate."""
+
+    # the latest message val1 has seen from val2 is on the candidate estimate,
+    v1_msg = view.latest_messages[val1]
+    if val2 not in v1_msg.justification.latest_messages:
+        return False
+
+    v2_msg_in_v1_view = v1_msg.justification.latest_messages[val2]
+    if candidate_estimate.conflicts_with(v2_msg_in_v1_view):
+        return False
+
+    # the latest block val2 has seen from val1 is on the candidate estimate
+    v2_msg = view.latest_messages[val2]
+    if val1 not in v2_msg.justification.latest_messages:
+        return False
+
+    v1_msg_in_v2_view = v2_msg.justification.latest_messages[val1]
+    if candidate_estimate.conflicts_with(v1_msg_in_v2_view):
+        return False
+
+    # there are no blocks from val2, that val1 has not seen;
+    # that might change validators' estimate.
+    if utils.exists_free_message(candidate_estimate, val2,
+                                 v2_msg_in_v1_view.sequence_number, view):
+        return False
+
+    # and if there are no blocks from val1, that val2 has not seen,
+    # that might change val2's estimate.
+    if utils.exists_free_message(candidate_estimate, val1,
+                                 v1_msg_in_v2_view.sequence_number, view):
+        return False
+
+    return True
+
+
+class CandidateGraph(object):
+    """The agreement graph on one candidate estimate, as of the last check.
+    It is kept as arrays over the validators, sorted by name, so that the edges
+    between all pairs come from a few elementwise comparisons."""
+
+    def __init__(self, candidate_estimate, validator_set):
+        self.candidate_estimate = candidate_estimate
+        self.validator_set = validator_set
+        self.validators = validator_set.sorted_by_name()
+
+        size = len(self.validators)
+        self.latest_messages = [None] * size
+        # with_candidate[i]: the latest message of validator i is on the candidate estimate
+        self.with_candidate = np.zeros(size, dtype=bool)
+        # seen_sequence[i, j]: sequence number of the latest message i has seen from j, or -1
+        self.seen_sequence = np.full((size, size), -1, dtype=np.int64)
+        # seen_agrees[i, j]: the latest message i has seen from j is on the candidate estimate
+        self.seen_agrees = np.zeros((size, size), dtype=bool)
+        # conflicting_sequence[j]: sequence number of the latest message from j that is not
+        # on the candidate estimate, or -1
+        self.conflicting_sequence = np.full(size, -1, dtype=np.int64)
+        self.adjacency = np.zeros((size, size), dtype=bool)
+
+        self._scanned = [0] * size
+        # validators whose rows must be re-evaluated before the edges are next used
+        self.dirty = set()
+
+    def refresh(self, view):
+        """Notes the validators whose latest message changed since the last check."""
+        for i, validator in enumerate(self.validators):
+            latest_message = view.latest_messages.get(validator)
+            if latest_message is self.latest_messages[i]:
+                continue
+
+            self.dirty.add(i)
+            self.latest_messages[i] = latest_message
+
+            # Only consider validators whose messages are compatable w/ candidate_estimate.
+            self.with_candidate[i] = latest_message is not None and \
+                not self.candidate_estimate.conflicts_with(latest_message)
+
+    def _update_row(self, i, view, agrees):
+        """Updates what validator i has seen, and its latest conflicting message.
+        agrees caches whether messages are on the candidate estimate."""
+        # the row of a validator not on the candidate estimate is never used, and is
+        # updated when its latest message changes again
+        latest_message = self.latest_messages[i]
+        seen = latest_message.justification.latest_messages if self.with_candidate[i] else dict()
+
+        seen_sequence = self.seen_sequence[i].tolist()
+        seen_agrees = self.seen_agrees[i].tolist()
+        for j, validator in enumerate(self.validators):
+            message = seen.get(validator)
+            if message is None:
+                seen_sequence[j] = -1
+                seen_agrees[j] = False
+            elif message.sequence_number != seen_sequence[j]:
+                if message not in agrees:
+                    agrees[message] = not self.candidate_estimate.conflicts_with(message)
+                seen_sequence[j] = message.sequence_number
+                seen_agrees[j] = agrees[message]
+
+        self.seen_sequence[i] = seen_sequence
+        self.seen_agrees[i] = seen_agrees
+
+        # a validator's messages only change along with its latest message, and any
+        # conflicting message among the new ones is later than those before
+        messages = view.messages_by_sender.get(self.validators[i], ())
+        for index in range(len(messages) - 1, self._scanned[i] - 1, -1):
+            if self.candidate_estimate.conflicts_with(messages[index]):
+                self.conflicting_sequence[i] = messages[index].sequence_number
+                break
+        self._scanned[i] = len(messages)
+
+    def update_edges(self, view):
+        """Re-evaluates the edges, if the latest message of any validator changed."""
+        if not self.dirty:
+            return
+
+        agrees = dict()
+        for i in self.dirty:
+            self._update_row(i, view, agrees)
+        self.dirty = set()
+
+        # i has seen a message from j on the candidate estimate, and j has no later
+        # message i has not seen that might change i's estimate.
+        one_way = self.seen_agrees & \
+            (self.seen_sequence > self.conflicting_sequence[np.newaxis, :])
+
+        self.adjacency = one_way & one_way.T
+        self.adjacency &= self.with_candidate[:, np.newaxis] & self.with_candidate[np.newaxis, :]
+        np.fill_diagonal(self.adjacency, False)
+
+
+class AgreementGraph(object):
+    """Keeps the validator agreement graphs used by clique oracles, for each candidate
+    estimate recently checked in a view. On each check, only the rows of validators whose
+    latest message changed since the previous check are re-evaluated."""
+
+    MAX_CANDIDATES = 128
+
+    def __init__(self, view):
+        self.view = view
+        self.candidates = OrderedDict()
+
+    def _get_graph(self, candidate_estimate, validator_set):
+        graph = self.candidates.get(candidate_estimate)
+        if graph is None or graph.validator_set is not validator_set:
+            graph = CandidateGraph(candidate_estimate, validator_set)
+            self.candidates[candidate_estimate] = graph
+
+            if len(self.candidates) > self.MAX_CANDIDATES:
+                self.candidates.popitem(last=False)
+        else:
+            self.candidates.move_to_end(candidate_estimate)
+
+        graph.refresh(self.view)
+        return graph
+
+    def with_candidate(self, candidate_estimate, validator_set):
+        """Returns the validators whose latest messages are on the candidate_estimate."""
+        graph = self._get_graph(candidate_estimate, validator_set)
+        return {graph.validators[i] for i in np.flatnonzero(graph.with_candidate)}
+
+    def adjacency(self, candidate_estimate, validator_set):
+        """Returns the validators, sorted by name, and the boolean matrix of which pairs
+        agree on the candidate_estimate."""
+        graph = self._get_graph(candidate_estimate, validator_set)
+        graph.update_edges(self.view)
+
+        return graph.validators, graph.adjacency
+
+    def edges(self, candidate_estimate, validator_set):
+        """Returns the pairs of validators that agree on the candidate_estimate."""
+        validators, adjacency = self.adjacency(candidate_estimate, validator_set)
+
+        return [
+            (validators[i], validators[j])
+            for i, j in zip(*np.nonzero(np.triu(adjacency)))
+        ]
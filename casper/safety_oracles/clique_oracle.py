@@ -1,7 +1,8 @@
 """The clique oracle module ... """
-import itertools
-import networkx as nx
+import numpy as np
+
 from casper.safety_oracles.abstract_oracle import AbstractOracle
+import casper.safety_oracles.weighted_clique as weighted_clique
 
 import casper.utils as utils
 
@@ -17,48 +18,19 @@ class CliqueOracle(AbstractOracle):
         self.view = view
         self.validator_set = validator_set
         # Only consider validators whose messages are compatable w/ candidate_estimate.
-        self.with_candidate = {
-            v for v in self.validator_set if v in self.view.latest_messages and
-            not self.candidate_estimate.conflicts_with(self.view.latest_messages[v])
-        }
+        # The view's agreement graph remembers these (and the edges between them)
+        # from previous checks of the same candidate_estimate.
+        self.with_candidate = self.view.agreement_graph.with_candidate(
+            self.candidate_estimate,
+            self.validator_set
+        )
 
     def _collect_edges(self):
-        edges = []
-        # For each pair of validators, val1, val2, add an edge if:
-        for val1, val2 in itertools.combinations(self.with_candidate, 2):
-            # the latest message val1 has seen from val2 is on the candidate estimate,
-            v1_msg = self.view.latest_messages[val1]
-            if val2 not in v1_msg.justification.latest_messages:
-                continue
-
-            v2_msg_in_v1_view = v1_msg.justification.latest_messages[val2]
-            if self.candidate_estimate.conflicts_with(v2_msg_in_v1_view):
-                continue
-
-            # the latest block val2 has seen from val1 is on the candidate estimate
-            v2_msg = self.view.latest_messages[val2]
-            if val1 not in v2_msg.justification.latest_messages:
-                continue
-
-            v1_msg_in_v2_view = v2_msg.justification.latest_messages[val1]
-            if self.candidate_estimate.conflicts_with(v1_msg_in_v2_view):
-                continue
-
-            # there are no blocks from val2, that val1 has not seen;
-            # that might change validators' estimate.
-            if utils.exists_free_message(self.candidate_estimate, val2,
-                                         v2_msg_in_v1_view.sequence_number, self.view):
-                continue
-
-            # and if there are no blocks from val1, that val2 has not seen,
-            # that might change val2's estimate.
-            if utils.exists_free_message(self.candidate_estimate, val1,
-                                         v1_msg_in_v2_view.sequence_number, self.view):
-                continue
-
-            edges.append((val1, val2))
-
-        return edges
+        # For each pair of validators, val1, val2, there is an edge if:
+        # the latest message each has seen from the other is on the candidate estimate,
+        # and neither has a later message the other has not seen that might change the
+        # other's estimate. See agreement_graph.validators_agree.
+        return self.view.agreement_graph.edges(self.candidate_estimate, self.validator_set)
 
     # Find biggest set of validators that
     # a) each of their latest messages is on the candidate_estimate
@@ -73,40 +45,45 @@ class CliqueOracle(AbstractOracle):
         if self.validator_set.weight(self.with_candidate) < self.validator_set.weight() / 2:
             return set(), 0
 
-        edges = self._collect_edges()
-        graph = nx.Graph()
-        graph.add_edges_from(edges)
-        cliques = nx.find_cliques(graph)
-
-        max_clique = []
-        max_weight = 0
-        for clique in cliques:
-            test_weight = utils.get_weight(clique)
-            if test_weight > max_weight:
-                max_clique = clique
-                max_weight = test_weight
+        validators, adjacency = self.view.agreement_graph.adjacency(
+            self.candidate_estimate,
+            self.validator_set
+        )
+        # only validators with some edge are in the graph
+        in_graph = np.flatnonzero(adjacency.any(axis=1))
+        clique_indexes, _ = weighted_clique.find_max_weight_clique_in_matrix(
+            [validators[i].weight for i in in_graph],
+            adjacency[np.ix_(in_graph, in_graph)]
+        )
+        max_clique = {validators[in_graph[i]] for i in clique_indexes}
 
-        return set(max_clique), max_weight
+        return max_clique, utils.get_weight(max_clique)
 
     def check_estimate_safety(self):
         """Returns lower bound on amount of fault tolerance some estimate has."""
 
         biggest_clique, clique_weight = self.find_biggest_clique()
 
-        # Minumum amount of weight that has to equivocate.
-        fault_tolerance = 2 * clique_weight - self.validator_set.weight()
+        return get_fault_tolerance(biggest_clique, clique_weight, self.validator_set)
+
+
+def get_fault_tolerance(biggest_clique, clique_weight, validator_set):
+    """Returns the fault tolerance some clique of validators gives an estimate."""
+
+    # Minumum amount of weight that has to equivocate.
+    fault_tolerance = 2 * clique_weight - validator_set.weight()
 
-        if fault_tolerance <= 0:
-            return 0, 0
+    if fault_tolerance <= 0:
+        return 0, 0
 
-        # Minimum number of validators that need to equivocate.
-        equivocating = set()
-        clique_weights = {v.weight for v in biggest_clique}
+    # Minimum number of validators that need to equivocate.
+    equivocating = set()
+    clique_weights = {v.weight for v in biggest_clique}
 
-        # Round to stop issues w/ floating point rounding.
-        while round(sum(equivocating), 2) < round(fault_tolerance, 2):
-            equivocating.add(max(clique_weights.difference(equivocating)))
+    # Round to stop issues w/ floating point rounding.
+    while round(sum(equivocating), 2) < round(fault_tolerance, 2):
+        equivocating.add(max(clique_weights.difference(equivocating)))
 
-        # Return the number of faults we can tolerate, which is one less
-        # than the number that need to equivocate.
-        return fault_tolerance, len(equivocating) - 1
+    # Return the number of faults we can tolerate, which is one less
+    # than the number that need to equivocate.
+    return fault_tolerance, len(equivocating) - 1
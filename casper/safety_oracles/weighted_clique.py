@@ -0,0 +1,135 @@
+"""The weighted clique module finds maximum weight cliques with a bitset branch and bound.
+Vertices are numbered heaviest first, and sets of vertices are python integers."""
+import numpy as np
+
+
+def _bits(bitset):
+    """Yields the vertices in a bitset, heaviest first."""
+    while bitset:
+        low_bit = bitset & -bitset
+        yield low_bit.bit_length() - 1
+        bitset ^= low_bit
+
+
+def _greedy_clique(weights, adjacency, alive):
+    """Returns a heavy clique (and its weight) to start the search from."""
+    best, best_weight = 0, 0
+    for start in _bits(alive):
+        clique, clique_weight = 1 << start, weights[start]
+        candidates = alive & adjacency[start]
+        while candidates:
+            # lowest set bit is the heaviest remaining candidate
+            vertex = (candidates & -candidates).bit_length() - 1
+            clique |= 1 << vertex
+            clique_weight += weights[vertex]
+            candidates &= adjacency[vertex]
+
+        if clique_weight > best_weight:
+            best, best_weight = clique, clique_weight
+
+    return best, best_weight
+
+
+def _reduce(weights, adjacency, alive, best_weight):
+    """Removes vertices that, even with all their neighbours, cannot beat best_weight.
+    Repeats until no more can be removed, like a k-core reduction."""
+    removed = True
+    while removed:
+        removed = False
+        for vertex in _bits(alive):
+            bound = weights[vertex] + sum(weights[n] for n in _bits(alive & adjacency[vertex]))
+            if bound <= best_weight:
+                alive &= ~(1 << vertex)
+                removed = True
+
+    return alive
+
+
+def _colour_bounds(weights, adjacency, candidates):
+    """Greedily colours the candidates into independent sets. Returns the candidates in
+    colour order, each with the summed heaviest weight of the colours up to its own;
+    no clique among a vertex and those before it can weigh more than that."""
+    order = []
+    bound = 0
+    uncoloured = candidates
+    while uncoloured:
+        colour = []
+        available = uncoloured
+        while available:
+            vertex = (available & -available).bit_length() - 1
+            colour.append(vertex)
+            available &= ~adjacency[vertex] & ~(1 << vertex)
+            uncoloured &= ~(1 << vertex)
+
+        # vertices are numbered heaviest first, so the first in a colour is the heaviest
+        bound += weights[colour[0]]
+        order.extend((vertex, bound) for vertex in colour)
+
+    return order
+
+
+def _max_weight_clique(vertex_weights, adjacency):
+    """Returns the maximum weight clique, as a bitset, of vertices numbered heaviest first
+    with adjacency bitsets, and its weight."""
+    alive = (1 << len(vertex_weights)) - 1
+    best, best_weight = _greedy_clique(vertex_weights, adjacency, alive)
+    alive = _reduce(vertex_weights, adjacency, alive, best_weight)
+
+    def expand(clique, clique_weight, candidates):
+        nonlocal best, best_weight
+
+        for vertex, bound in reversed(_colour_bounds(vertex_weights, adjacency, candidates)):
+            # no clique from here on can beat the best found so far
+            if clique_weight + bound <= best_weight:
+                return
+
+            new_weight = clique_weight + vertex_weights[vertex]
+            new_candidates = candidates & adjacency[vertex]
+            if new_candidates:
+                expand(clique | 1 << vertex, new_weight, new_candidates)
+            elif new_weight > best_weight:
+                best, best_weight = clique | 1 << vertex, new_weight
+
+            candidates &= ~(1 << vertex)
+
+    expand(0, 0, alive)
+
+    return best, best_weight
+
+
+def find_max_weight_clique(weights, edges):
+    """Returns the maximum weight clique of the graph with some edges, and its weight.
+    weights maps each vertex in the graph to its weight."""
+    vertices = sorted(weights, key=lambda v: weights[v], reverse=True)
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    vertex_weights = [weights[vertex] for vertex in vertices]
+
+    adjacency = [0] * len(vertices)
+    for vertex_1, vertex_2 in edges:
+        adjacency[index[vertex_1]] |= 1 << index[vertex_2]
+        adjacency[index[vertex_2]] |= 1 << index[vertex_1]
+
+    best, best_weight = _max_weight_clique(vertex_weights, adjacency)
+
+    return {vertices[i] for i in _bits(best)}, best_weight
+
+
+def find_max_weight_clique_in_matrix(weights, adjacency):
+    """Returns the indexes of the maximum weight clique of the graph with a symmetric boolean
+    adjacency matrix, and its weight. weights[i] is the weight of vertex i."""
+    if not len(weights):
+        return set(), 0
+
+    # heaviest first, keeping the given order among equal weights
+    order = sorted(range(len(weights)), key=lambda i: weights[i], reverse=True)
+    vertex_weights = [weights[i] for i in order]
+
+    ordered_adjacency = np.asarray(adjacency, dtype=bool)[np.ix_(order, order)]
+    bitsets = [
+        sum(1 << int(column) for column in np.flatnonzero(row))
+        for row in ordered_adjacency
+    ]
+
+    best, best_weight = _max_weight_clique(vertex_weights, bitsets)
+
+    return {order[i] for i in _bits(best)}, best_weight
@@ -6,17 +6,12 @@ def exists_free_message(estimate, val, sequence_num, view):
     A free message is a message later than the sequence number from some val,
     and conflicts with the estimate."""
 
-    curr_message = view.latest_messages[val]
+    messages = view.messages_by_sender[val]
 
-    while curr_message.sequence_number >= sequence_num:
-        if estimate.conflicts_with(curr_message):
+    for index in range(len(messages) - 1, max(sequence_num, 0) - 1, -1):
+        if estimate.conflicts_with(messages[index]):
             return True
 
-        if curr_message.sequence_number == 0:
-            break
-
-        curr_message = curr_message.justification.latest_messages[val]
-
     return False
 
 
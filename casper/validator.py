@@ -4,7 +4,7 @@ from casper.blockchain.blockchain_protocol import BlockchainProtocol
 
 class Validator(object):
     """A validator has a view from which it generates new messages and detects finalized blocks."""
-    def __init__(self, name, weight, protocol=BlockchainProtocol, validator_set=None):
+    def __init__(self, name, weight, protocol=BlockchainProtocol, validator_set=None, rng=None):
         if name is None:
             raise ValueError("Validator name must be defined.")
         if not isinstance(weight, numbers.Number):
@@ -14,7 +14,7 @@ class Validator(object):
 
         self.name = name
         self.weight = weight
-        self.view = protocol.View(set())
+        self.view = protocol.View(set(), rng)
         self.validator_set = validator_set
 
     def receive_messages(self, messages):
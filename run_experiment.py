@@ -1,6 +1,7 @@
 import argparse
 import json
 import os
+import random
 
 from datetime import datetime
 import calendar
@@ -24,6 +25,15 @@ def main():
         help='specifies the json file with the experiment params'
     )
 
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='specifies the number of processes to run simulations in'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=None,
+        help='specifies the seed of the random choices made, to replay an experiment'
+    )
+
     args = parser.parse_args()
 
     with open(args.json_file) as f:
@@ -35,15 +45,23 @@ def main():
     experiment_name = "{}-{}".format(file_name, timestamp())
     protocol = select_protocol(config['protocol'])
 
+    # a copied config replays the experiment it was copied from
+    seed = args.seed if args.seed is not None else config.get('seed')
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    config['seed'] = seed
+
     experiment = Experiment(
         experiment_name,
         config['data'],
         config['num_simulations'],
-        validator_generator(config['validator_info'], protocol),
+        validator_generator(config['validator_info'], protocol, random.Random(seed)),
         config['msg_mode'],
         protocol,
         config['rounds_per_sim'],
-        config['report_interval']
+        config['report_interval'],
+        workers=args.workers,
+        seed=seed
     )
 
     experiment.run()
@@ -58,6 +76,7 @@ def main():
 
     print()
     print("Output written to: {}/".format(experiment.output_dir))
+    print("Seed: {}".format(seed))
 
 
 if __name__ == '__main__':
@@ -1,24 +1,96 @@
-import statistics
+from fractions import Fraction
 
+from casper.blockchain.blockchain_view import BlockchainView
 import casper.utils as utils
 
 
 class Analyzer:
+    """Collects data on a simulation. It listens to the global view, and keeps the counts its
+    data comes from up to date as messages are added and blocks finalized, so collecting
+    data costs time in the number of new messages, rather than in all messages."""
+
     def __init__(self, simulation):
         self.simulation = simulation
         self.global_view = simulation.network.global_view
+        self.is_blockchain = isinstance(self.global_view, BlockchainView)
+
+        self._num_messages = 0
+        self._num_safe_messages = 0
+        self._total_latency = 0
+
+        # The safe tip height, and the number of messages at or below it.
+        self._safe_height = 0
+        self._num_at_or_below_safe_height = 0
+
+        # For messages above the safe tip height, in total and at each height: the number of
+        # messages, of children of those messages, and of those messages with children.
+        self._above = [0, 0, 0]
+        self._above_by_height = dict()
+        self._num_children = dict()
+
+        self.on_messages_added(self.global_view, self.global_view.messages)
+        if self.is_blockchain:
+            self.on_estimates_finalized(self.global_view, list(self.global_view.when_finalized))
+
+        self.global_view.add_listener(self)
+
+    def _count_above(self, height, counts):
+        above_at_height = self._above_by_height.setdefault(height, [0, 0, 0])
+        for i, count in enumerate(counts):
+            above_at_height[i] += count
+            self._above[i] += count
+
+    def on_messages_added(self, view, messages):
+        self._num_messages += len(messages)
+        if not self.is_blockchain:
+            return
+
+        for message in messages:
+            if message.height > self._safe_height:
+                self._count_above(message.height, (1, 0, 0))
+            else:
+                self._num_at_or_below_safe_height += 1
+
+            parent = message.estimate
+            if parent is None:
+                continue
+
+            self._num_children[parent] = self._num_children.get(parent, 0) + 1
+            if parent.height > self._safe_height:
+                first_child = int(self._num_children[parent] == 1)
+                self._count_above(parent.height, (0, 1, first_child))
+
+    def on_estimates_finalized(self, view, blocks):
+        if not self.is_blockchain:
+            return
+
+        self._num_safe_messages += len(blocks)
+        self._total_latency += sum(
+            view.when_finalized[block] - view.when_added[block]
+            for block in blocks
+        )
+
+        # messages up to the new safe tip are now safe or unsafe, rather than bivalent
+        safe_height = self.safe_tip_height()
+        for height in range(self._safe_height + 1, safe_height + 1):
+            above_at_height = self._above_by_height.pop(height, [0, 0, 0])
+            self._num_at_or_below_safe_height += above_at_height[0]
+            for i, count in enumerate(above_at_height):
+                self._above[i] -= count
+
+        self._safe_height = safe_height
 
     def num_messages(self):
-        return len(self.messages())
+        return self._num_messages
 
     def num_safe_messages(self):
-        return len(self.safe_messages())
+        return self._num_safe_messages
 
     def num_unsafe_messages(self):
-        return len(self.unsafe_messages())
+        return self._num_at_or_below_safe_height - self._num_safe_messages
 
     def num_bivalent_messages(self):
-        return len(self.bivalent_messages())
+        return self._above[0]
 
     def prop_safe_messages(self):
         return float(self.num_safe_messages()) / self.num_messages()
@@ -39,20 +111,10 @@ class Analyzer:
         return max_height - self.safe_tip_height()
 
     def bivalent_message_branching_factor(self):
-        to_check = set(self.bivalent_messages())
-        if self.safe_tip():
-            to_check.add(self.safe_tip())
-
-        check = to_check.pop()
-        branches = 0
-        num_checked = 0
-        while check:
-            if check in self.global_view.children:
-                branches += len(self.global_view.children[check])
-                num_checked += 1
-            if not to_check:
-                break
-            check = to_check.pop()
+        _, branches, num_checked = self._above
+        if self.safe_tip() in self._num_children:
+            branches += self._num_children[self.safe_tip()]
+            num_checked += 1
 
         if num_checked == 0:
             return 0
@@ -90,17 +152,14 @@ class Analyzer:
         }
 
     def latency_to_finality(self):
-        safe_messages = self.safe_messages()
-
-        if not any(safe_messages):
+        if not self._num_safe_messages:
             return None
 
-        individual_latency = [
-            self.global_view.when_finalized[message] - self.global_view.when_added[message]
-            for message in safe_messages
-        ]
-
-        return statistics.mean(individual_latency)
+        # the mean of the latencies, as statistics.mean would give it
+        latency = Fraction(self._total_latency, self._num_safe_messages)
+        if latency.denominator == 1:
+            return int(latency)
+        return float(latency)
 
     def orphan_rate(self):
         num_unsafe_messages = self.num_unsafe_messages()
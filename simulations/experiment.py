@@ -1,7 +1,10 @@
 import csv
+from fractions import Fraction
 import json
+import math
+import multiprocessing
 import os
-import statistics
+import random as r
 
 from simulations.analyzer import Analyzer
 from simulations.simulation_runner import SimulationRunner
@@ -10,6 +13,46 @@ from simulations.utils import (
 )
 
 
+# The experiment a worker process runs simulations for.
+_worker_experiment = None
+
+
+def _init_worker(experiment):
+    global _worker_experiment
+    _worker_experiment = experiment
+
+
+def _run_sim(sim_id):
+    return _worker_experiment.run_sim(sim_id)
+
+
+class IntervalStats:
+    """Keeps exact running sums of some data, so that its mean and standard deviation
+    can be found in one pass, and do not depend on the order the data is added in."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = Fraction(0)
+        self.total_of_squares = Fraction(0)
+        self.all_ints = True
+
+    def add(self, value):
+        self.count += 1
+        self.total += Fraction(value)
+        self.total_of_squares += Fraction(value) ** 2
+        self.all_ints = self.all_ints and isinstance(value, int)
+
+    def mean(self):
+        mean = self.total / self.count
+        if self.all_ints and mean.denominator == 1:
+            return int(mean)
+        return float(mean)
+
+    def stdev(self):
+        sum_of_squares = self.total_of_squares - self.total ** 2 / self.count
+        return math.sqrt(sum_of_squares / (self.count - 1))
+
+
 class Experiment:
     INTERVAL_STATS = ["mean", "stdev"]
 
@@ -22,7 +65,9 @@ class Experiment:
             msg_mode,
             protocol,
             sim_rounds,
-            sim_report_interval
+            sim_report_interval,
+            workers=1,
+            seed=None
     ):
         self.name = name
         self.data = data
@@ -33,72 +78,120 @@ class Experiment:
         self.sim_rounds = sim_rounds
         self.sim_report_interval = sim_report_interval
         self.intervals = int(self.sim_rounds / self.sim_report_interval)
+        self.workers = workers
+
+        # Each simulation is seeded from this, so results do not depend on the workers.
+        if seed is None:
+            seed = r.randrange(2 ** 32)
+        self.seed = seed
 
         self.sim_number = 0
-        self.analyzer_data = {'simulation_data': {}}
+        self.analyzer_data = {}
 
     def run(self):
         print("Running", end='')
-        while self.sim_number < self.num_simulations:
-            self.run_sim(self.sim_number)
-            self.sim_number += 1
-            print(".", end='', flush=True)
+        self._make_output_dir()
+        # simulations append their data to this file as each interval completes
+        open(self.simulation_data_file, 'w').close()
+
+        sim_ids = range(self.sim_number, self.num_simulations)
+
+        if self.workers > 1:
+            with multiprocessing.Pool(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(self,)
+            ) as pool:
+                self._count_finished(pool.imap_unordered(_run_sim, sim_ids))
+        else:
+            self._count_finished(map(self.run_sim, sim_ids))
 
         print(" complete!")
 
         self._aggregate_data()
 
+    def _count_finished(self, finished_sims):
+        for _ in finished_sims:
+            self.sim_number += 1
+            print(".", end='', flush=True)
+
+    def sim_seed(self, sim_id):
+        """Returns the seed of a simulation."""
+        return "{}-{}".format(self.seed, sim_id)
+
     def run_sim(self, sim_id):
-        validator_set = self.validator_set_generator()
+        """Runs a simulation, appending the data collected at each interval
+        to the simulation data file."""
+        rng = r.Random(self.sim_seed(sim_id))
+
+        validator_set = self.validator_set_generator(rng=rng)
         runner = SimulationRunner(
             validator_set,
-            message_maker(self.msg_mode),
+            message_maker(self.msg_mode, rng),
             self.protocol,
             total_rounds=self.sim_rounds,
             report_interval=self.sim_report_interval,
             display=False,
             save=False
         )
-        for interval in range(self.intervals):
-            for step in range(runner.report_interval):
-                runner.step()
 
-            self._collect_data(runner, sim_id, interval)
+        # the analyzer follows the simulation as it runs
+        analyzer = Analyzer(runner)
+
+        with open(self.simulation_data_file, 'a') as f:
+            for interval in range(self.intervals):
+                for step in range(runner.report_interval):
+                    runner.step()
+
+                row = {
+                    'sim_id': sim_id,
+                    'interval': interval,
+                    'data': self._collect_data(analyzer)
+                }
+                f.write(json.dumps(row) + "\n")
+                f.flush()
+
+    def read_simulation_data(self):
+        """Yields each row of simulation data written so far, in the order written.
+        A last row that is only partly written is left out."""
+        with open(self.simulation_data_file) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                yield json.loads(line)
 
     def _aggregate_data(self):
-        aggregated = {
-            interval: self._aggregate_interval_data(interval)
+        stats = {
+            interval: {data: IntervalStats() for data in self.data}
             for interval in range(self.intervals)
         }
-        self.analyzer_data["aggregated"] = aggregated
+        for row in self.read_simulation_data():
+            for data in self.data:
+                if row['data'][data]:
+                    stats[row['interval']][data].add(row['data'][data])
 
-    def _aggregate_interval_data(self, interval):
+        self.analyzer_data["aggregated"] = {
+            interval: self._aggregate_interval_data(interval, stats[interval])
+            for interval in range(self.intervals)
+        }
+
+    def _aggregate_interval_data(self, interval, interval_stats):
         aggregated_interval = {}
         for data in self.data:
-            interval_list = [
-                self.analyzer_data['simulation_data'][sim_id][interval][data]
-                for sim_id in self.analyzer_data['simulation_data']
-                if self.analyzer_data['simulation_data'][sim_id][interval][data]
-            ]
             for stat in self.INTERVAL_STATS:
                 key = "{}-{}".format(data, stat)
-                if len(interval_list) > 1:
-                    aggregated_interval[key] = getattr(statistics, stat)(interval_list)
+                if interval_stats[data].count > 1:
+                    aggregated_interval[key] = getattr(interval_stats[data], stat)()
                 else:
                     aggregated_interval[key] = None
 
         aggregated_interval['interval'] = interval
         return aggregated_interval
 
-    def _collect_data(self, runner, sim_id, interval):
-        if sim_id not in self.analyzer_data["simulation_data"]:
-            self.analyzer_data['simulation_data'][sim_id] = {}
-
-        analyzer = Analyzer(runner)
-        self.analyzer_data['simulation_data'][sim_id][interval] = {
+    def _collect_data(self, analyzer):
+        return {
             d: getattr(analyzer, d)()
             for d in self.data
-
         }
 
     def output_results(self):
@@ -133,3 +226,7 @@ class Experiment:
     @property
     def output_dir(self):
         return "out/{}".format(self.name)
+
+    @property
+    def simulation_data_file(self):
+        return "{}/simulation_data.jsonl".format(self.output_dir)
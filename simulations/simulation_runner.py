@@ -1,6 +1,8 @@
 import sys
 
 from casper.network import Network
+from casper.plot_tool import NullPlotTool
+from simulations.trace import TraceRecorder
 
 
 class SimulationRunner:
@@ -13,6 +15,9 @@ class SimulationRunner:
             report_interval,
             display,
             save,
+            background_save=False,
+            window=None,
+            trace=None,
     ):
         self.validator_set = validator_set
         self.msg_gen = msg_gen
@@ -30,43 +35,85 @@ class SimulationRunner:
             self.report_interval = 1
 
         self.network = Network(validator_set, protocol)
+
+        # With a trace path, the simulation is recorded so it can be replayed later.
+        self.trace_recorder = None
+        if trace:
+            self.trace_recorder = TraceRecorder(trace, validator_set, protocol)
+            self.network.global_view.add_listener(self.trace_recorder)
+
         self.network.random_initialization()
 
-        self.plot_tool = protocol.PlotTool(display, save, self.network.global_view, validator_set)
-        self.plot_tool.plot()
+        # Nothing is shown or saved when headless, so no plotting state is kept at all
+        self.headless = not display and not save
+        if self.headless:
+            self.plot_tool = NullPlotTool(display, save, self.network.global_view, validator_set)
+        else:
+            self.plot_tool = protocol.PlotTool(
+                display,
+                save,
+                self.network.global_view,
+                validator_set,
+                background_save,
+                window
+            )
+            self.plot_tool.plot()
 
     def run(self):
         """ run simulation total_rounds if specified
             otherwise, run indefinitely """
-        while self.round < self.total_rounds:
-            self.step()
+        try:
+            while self.round < self.total_rounds:
+                self.step()
+
+            if self.save:
+                self.plot_tool.make_gif()
+        finally:
+            self.close()
 
-        if self.save:
-            self.plot_tool.make_gif()
+    def close(self):
+        """ finish the trace, if one is recorded. run closes it, but callers
+            that only step the simulation must close it themselves """
+        if self.trace_recorder:
+            self.trace_recorder.close()
 
     def step(self):
         """ run one round of the simulation """
         self.round += 1
         message_paths = self.msg_gen(self.validator_set)
 
-        affected_validators = {j for i, j in message_paths}
+        if self.trace_recorder:
+            self.trace_recorder.record_round(self.round)
+
+        affected_validators = sorted({j for i, j in message_paths}, key=lambda v: v.name)
 
         sent_messages = self._send_messages_along_paths(message_paths)
         new_messages = self._make_new_messages(affected_validators)
         self._check_for_new_safety(affected_validators)
 
+        if self.trace_recorder:
+            self.trace_recorder.flush()
+
+        if self.headless:
+            return
+
         self.plot_tool.update(message_paths, sent_messages, new_messages)
         if self.round % self.report_interval == self.report_interval - 1:
             self.plot_tool.plot()
 
     def _send_messages_along_paths(self, message_paths):
         sent_messages = {}
+        deliveries = []
         # Send most recent message of sender to receive
         for sender, receiver in message_paths:
             message = sender.my_latest_message()
-            self.network.propagate_message_to_validator(message, receiver)
+            deliveries.append((message, receiver))
             sent_messages[sender] = message
 
+        if self.trace_recorder:
+            self.trace_recorder.record_deliveries(deliveries)
+        self.network.propagate_messages_to_validators(deliveries)
+
         return sent_messages
 
     def _make_new_messages(self, validators):
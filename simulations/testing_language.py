@@ -5,7 +5,6 @@ import random as r
 from casper.blockchain.blockchain_protocol import BlockchainProtocol
 from casper.network import Network
 from casper.plot_tool import PlotTool
-from casper.safety_oracles.clique_oracle import CliqueOracle
 from casper.validator_set import ValidatorSet
 import casper.utils as utils
 
@@ -162,10 +161,10 @@ class TestLangCBC(object):
             return
 
         # Update the safe blocks!
+        sweep = self.network.global_view.safety_sweep(self.validator_set)
         tip = self.network.global_view.estimate()
         while tip and self.block_fault_tolerance.get(tip, 0) != len(self.validator_set) - 1:
-            oracle = CliqueOracle(tip, self.network.global_view, self.validator_set)
-            fault_tolerance, num_node_ft = oracle.check_estimate_safety()
+            fault_tolerance, num_node_ft = sweep.check_height(tip.height)
 
             if fault_tolerance > 0:
                 self.block_fault_tolerance[tip] = num_node_ft
@@ -0,0 +1,212 @@
+"""The trace module records simulations to JSON lines files, and replays them.
+
+A trace starts with the validator set, then lists every message as it is added to the
+global view, and the messages delivered to validators each round. Messages are numbered in
+the order they are recorded. A justification is recorded as the entries that changed from
+the justification of the sender's previous message, which is usually only a few."""
+import gzip
+import json
+
+from casper.binary.binary_protocol import BinaryProtocol
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+from casper.justification import Justification, PersistentMap
+from casper.message import Message
+from casper.network import Network
+from casper.validator_set import ValidatorSet
+
+PROTOCOLS = {
+    'BlockchainProtocol': BlockchainProtocol,
+    'BinaryProtocol': BinaryProtocol,
+}
+
+
+def _open(path, mode):
+    """Opens a trace, compressed if its name ends with .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't')
+    return open(path, mode)
+
+
+class TraceRecorder(object):
+    """Records a simulation to a trace, listening to its global view for new messages."""
+
+    def __init__(self, path, validator_set, protocol):
+        self.path = path
+        self.trace = _open(path, 'w')
+
+        self.ids = dict()
+        self.justifications = dict()
+
+        self._write({
+            'type': 'validators',
+            'protocol': protocol.__name__,
+            'validators': [
+                [validator.name, validator.weight]
+                for validator in validator_set.sorted_by_name()
+            ]
+        })
+
+    def _write(self, event):
+        self.trace.write(json.dumps(event) + '\n')
+
+    def on_messages_added(self, view, messages):
+        """Records messages added to the global view, in the order they were made."""
+        for message in sorted(messages, key=lambda message: message.id):
+            self._record_message(message)
+
+    def _record_message(self, message):
+        latest_messages = message.justification.latest_messages
+        previous = self.justifications.get(message.sender, {})
+        changed = [
+            [validator.name, self.ids[justified]]
+            for validator, justified in latest_messages.items()
+            if previous.get(validator) != justified
+        ]
+        self.justifications[message.sender] = latest_messages
+
+        estimate = message.estimate
+        if isinstance(estimate, Message):
+            estimate = self.ids[estimate]
+
+        self.ids[message] = len(self.ids)
+        self._write({
+            'type': 'message',
+            'id': self.ids[message],
+            'sender': message.sender.name,
+            'estimate': estimate,
+            'justification': sorted(changed, key=lambda entry: entry[1])
+        })
+
+    def record_round(self, round_number):
+        """Records the start of a round."""
+        self._write({'type': 'round', 'round': round_number})
+
+    def record_deliveries(self, deliveries):
+        """Records the (message, validator) deliveries of a round."""
+        self._write({
+            'type': 'deliver',
+            'deliveries': [
+                [self.ids[message], validator.name] for message, validator in deliveries
+            ]
+        })
+
+    def flush(self):
+        """Writes out the events recorded so far."""
+        self.trace.flush()
+
+    def close(self):
+        """Finishes the trace."""
+        self.trace.close()
+
+
+def read_trace(path):
+    """Returns the events of a trace, read one line at a time. A trace that was not closed
+    is read up to its last complete line, as a last line may be only partly written and a
+    compressed trace has no end marker."""
+    with _open(path, 'r') as trace:
+        try:
+            for line in trace:
+                if not line.endswith('\n'):
+                    break
+                yield json.loads(line)
+        except EOFError:
+            return
+
+
+class TraceReplayer(object):
+    """Rebuilds the views of a recorded simulation, round by round. Messages are rebuilt
+    from their recorded estimates and justifications, so no fork choice is run. The views
+    are the same as they were in the simulation, so an Analyzer can be made for a replayer as
+    for a SimulationRunner, and safety oracles run on the views, as the trace replays."""
+
+    def __init__(self, path, check_safety=True):
+        self.events = read_trace(path)
+        self.check_safety = check_safety
+
+        header = next(self.events)
+        assert header['type'] == 'validators', "...expected a trace to start with validators"
+        self.protocol = PROTOCOLS[header['protocol']]
+        self.validator_set = ValidatorSet(
+            {name: weight for name, weight in header['validators']},
+            self.protocol
+        )
+        self.validators = {validator.name: validator for validator in self.validator_set}
+
+        self.network = Network(self.validator_set, self.protocol)
+        self.messages = []
+        self.justifications = dict()
+
+        self.round = 0
+        self._next_event = next(self.events, None)
+
+        # the messages made before the first round
+        for event in self._round_events():
+            self._replay_event(event)
+
+    def _round_events(self):
+        while self._next_event is not None and self._next_event['type'] != 'round':
+            event = self._next_event
+            self._next_event = next(self.events, None)
+            yield event
+
+    def _replay_event(self, event):
+        if event['type'] == 'deliver':
+            self._deliver(event['deliveries'])
+            return None
+
+        assert event['type'] == 'message', "...unexpected event " + event['type']
+        return self._replay_message(event)
+
+    def _deliver(self, deliveries):
+        self.network.propagate_messages_to_validators([
+            (self.messages[message_id], self.validators[name]) for message_id, name in deliveries
+        ])
+
+    def _replay_message(self, event):
+        sender = self.validators[event['sender']]
+
+        latest_messages = self.justifications.get(sender, PersistentMap())
+        latest_messages = latest_messages.update({
+            self.validators[name]: self.messages[message_id]
+            for name, message_id in event['justification']
+        })
+        self.justifications[sender] = latest_messages
+
+        estimate = event['estimate']
+        if self.protocol is BlockchainProtocol and estimate is not None:
+            estimate = self.messages[estimate]
+
+        message = self.protocol.Message(estimate, Justification(latest_messages), sender)
+        assert len(self.messages) == event['id'], "...expected messages in recorded order"
+        self.messages.append(message)
+
+        sender.view.add_messages(set([message]))
+        self.network.global_view.add_messages(set([message]))
+
+        return message
+
+    def step(self):
+        """Replays the next round. Returns False if there are no more rounds."""
+        if self._next_event is None:
+            return False
+
+        self.round = self._next_event['round']
+        self._next_event = next(self.events, None)
+
+        affected_validators = set()
+        for event in self._round_events():
+            message = self._replay_event(event)
+            if message is not None:
+                affected_validators.add(message.sender)
+
+        if self.check_safety:
+            for validator in sorted(affected_validators, key=lambda v: v.name):
+                validator.update_safe_estimates()
+            self.network.global_view.update_safe_estimates(self.validator_set)
+
+        return True
+
+    def run(self):
+        """Replays all remaining rounds."""
+        while self.step():
+            pass
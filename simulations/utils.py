@@ -1,4 +1,5 @@
 """The simulution utils module ... """
+import functools
 import itertools
 import random as r
 
@@ -18,16 +19,17 @@ def select_protocol(protocol):
         return BinaryProtocol
 
 
-def message_maker(mode):
-    """The message maker defines the logic for running each type of simulation."""
+def message_maker(mode, rng=r):
+    """The message maker defines the logic for running each type of simulation.
+    Any random choices are made with rng."""
 
     if mode == "rand":
 
         def random(validator_set, num_messages=1):
             """Each round, some randomly selected validators propagate their most recent
             message to other randomly selected validators, who then create new messages."""
-            pairs = list(itertools.permutations(validator_set, 2))
-            return r.sample(pairs, num_messages)
+            pairs = list(itertools.permutations(validator_set.sorted_by_name(), 2))
+            return rng.sample(pairs, num_messages)
 
         return random
 
@@ -54,7 +56,7 @@ def message_maker(mode):
         def full_propagation(validator_set):
             """Each round, all validators receive all other validators previous
             messages, and then all create messages."""
-            pairs = list(itertools.permutations(validator_set, 2))
+            pairs = list(itertools.permutations(validator_set.sorted_by_name(), 2))
             return pairs
 
         return full_propagation
@@ -78,9 +80,11 @@ def generate_random_gaussian_validator_set(
         num_validators=5,
         mu=60,
         sigma=40,
-        min_weight=20
+        min_weight=20,
+        rng=r
         ):
-    """Generates a random validator set."""
+    """Generates a random validator set, with weights drawn from rng.
+    Its validators make any random choices with rng too."""
 
     # Give the validators random weights in 0.,BIGINT;
     # this "big" integer's job is to guarantee the "tie-breaking property"
@@ -91,35 +95,32 @@ def generate_random_gaussian_validator_set(
 
     names = set(range(num_validators))
     weights = {
-        i: max(min_weight, r.gauss(mu, sigma))
-        + 1.0/(BIGINT + r.uniform(0, 1)) + r.random()
+        i: max(min_weight, rng.gauss(mu, sigma))
+        + 1.0/(BIGINT + rng.uniform(0, 1)) + rng.random()
         for i in names
     }
 
-    return ValidatorSet(weights, protocol)
+    return ValidatorSet(weights, protocol, rng)
 
 
-def validator_generator(config, protocol):
+def validator_generator(config, protocol, rng=r):
+    """Returns a function that generates validator sets as described in some config.
+    It can be pickled, so it can be sent to other processes, and takes an optional rng
+    for the validator set to use. Weights from the config are jittered once, with rng."""
     if config['gen_type'] == 'gauss':
-
-        def gauss_generator():
-            return generate_random_gaussian_validator_set(
-                protocol,
-                config['num_validators'],
-                config['mu'],
-                config['sigma'],
-                config['min_weight']
-            )
-
-        return gauss_generator
+        return functools.partial(
+            generate_random_gaussian_validator_set,
+            protocol,
+            config['num_validators'],
+            config['mu'],
+            config['sigma'],
+            config['min_weight']
+        )
 
     if config['gen_type'] == 'weights':
         jitter_weights = {
-            i: weight + r.random()
+            i: weight + rng.random()
             for i, weight in enumerate(config['weights'])
         }
 
-        def weights_generator():
-            return ValidatorSet(jitter_weights, protocol)
-
-        return weights_generator
+        return functools.partial(ValidatorSet, jitter_weights, protocol)
@@ -115,3 +115,51 @@ def test_block_height(report, test_string, weights, block_heights):
     for block_name in block_heights:
         block = test_lang.blocks[block_name]
         assert block.height == block_heights[block_name]
+
+
+def test_is_in_blockchain__long_chain(validator):
+    chain = [Block(None, Justification(), validator)]
+    for i in range(5000):
+        chain.append(Block(chain[-1], Justification(), validator))
+
+    fork = Block(chain[2000], Justification(), validator)
+
+    assert chain[0].is_in_blockchain(chain[-1])
+    assert chain[2000].is_in_blockchain(chain[-1])
+    assert chain[2000].is_in_blockchain(fork)
+    assert not chain[2001].is_in_blockchain(fork)
+    assert not chain[-1].is_in_blockchain(chain[0])
+    assert fork.conflicts_with(chain[-1])
+    assert not chain[1234].conflicts_with(chain[-1])
+
+
+def test_get_ancestor_at_height(validator):
+    chain = [Block(None, Justification(), validator)]
+    for i in range(300):
+        chain.append(Block(chain[-1], Justification(), validator))
+
+    for block in chain[::7]:
+        for height in range(1, block.height + 1):
+            assert block.get_ancestor_at_height(height) == chain[height - 1]
+
+        assert block.get_ancestor_at_height(block.height + 1) is None
+        assert block.get_ancestor_at_height(0) is None
+
+
+def test_get_common_ancestor(validator):
+    chain = [Block(None, Justification(), validator)]
+    for i in range(300):
+        chain.append(Block(chain[-1], Justification(), validator))
+
+    fork = [Block(chain[100], Justification(), validator)]
+    for i in range(50):
+        fork.append(Block(fork[-1], Justification(), validator))
+
+    other_genesis = Block(None, Justification(), validator)
+
+    assert chain[-1].get_common_ancestor(fork[-1]) == chain[100]
+    assert fork[-1].get_common_ancestor(chain[-1]) == chain[100]
+    assert fork[20].get_common_ancestor(chain[50]) == chain[50]
+    assert chain[200].get_common_ancestor(chain[150]) == chain[150]
+    assert chain[7].get_common_ancestor(chain[7]) == chain[7]
+    assert chain[-1].get_common_ancestor(other_genesis) is None
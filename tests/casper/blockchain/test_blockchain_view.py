@@ -1,8 +1,13 @@
 """The BlockchainView testing module..."""
+import random as r
+
 import pytest
 
 from casper.blockchain.blockchain_protocol import BlockchainProtocol
+import casper.blockchain.forkchoice as forkchoice
+from simulations.simulation_runner import SimulationRunner
 from simulations.testing_language import TestLangCBC
+import simulations.utils as utils
 
 
 @pytest.mark.parametrize(
@@ -46,3 +51,79 @@ def test_get_new_messages(weights, test_string, showed_message_names, new_messag
     new_messages = {test_lang.blocks[name] for name in new_message_names}
 
     assert view.get_new_messages(showed_messages) == new_messages
+
+
+@pytest.mark.parametrize(
+    'mode',
+    [
+        ('rand'),
+        ('full'),
+        ('nofinal'),
+    ]
+)
+def test_incremental_scores_match_forkchoice(generate_validator_set, mode):
+    validator_set = generate_validator_set(BlockchainProtocol)
+    msg_gen = utils.message_maker(mode)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        msg_gen,
+        BlockchainProtocol,
+        50,
+        50,
+        False,
+        False
+    )
+
+    for i in range(50):
+        simulation_runner.step()
+
+        views = [v.view for v in validator_set] + [simulation_runner.network.global_view]
+        for view in views:
+            scores = forkchoice.get_scores(None, view.latest_messages)
+            assert set(view.scores) == set(scores)
+            for block in scores:
+                assert round(view.scores[block], 6) == round(scores[block], 6)
+
+            assert view.estimate() == forkchoice.get_fork_choice(
+                view.last_finalized_block,
+                view.children,
+                view.latest_messages
+            )
+
+
+def get_new_messages_by_search(view, showed_messages):
+    new_messages = set()
+    to_check = set(showed_messages)
+    while to_check:
+        message = to_check.pop()
+        if message in view.messages or message in new_messages:
+            continue
+        new_messages.add(message)
+        to_check.update(message.justification.latest_messages.values())
+
+    return new_messages
+
+
+def test_get_new_messages_matches_search(generate_validator_set):
+    validator_set = generate_validator_set(BlockchainProtocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker('rand'),
+        BlockchainProtocol,
+        60,
+        60,
+        False,
+        False
+    )
+    for i in range(60):
+        simulation_runner.step()
+
+    global_messages = list(simulation_runner.network.global_view.messages)
+    for validator in validator_set:
+        view = validator.view
+        for i in range(10):
+            showed_messages = set(r.sample(global_messages, 3))
+            assert view.get_new_messages(showed_messages) == \
+                get_new_messages_by_search(view, showed_messages)
+
+        assert view.get_new_messages(view.messages) == set()
@@ -0,0 +1,76 @@
+"""The safety sweep testing module ... """
+import pytest
+
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+from casper.safety_oracles.clique_oracle import CliqueOracle
+from simulations.simulation_runner import SimulationRunner
+import simulations.utils as utils
+
+
+def deepest_safe_block_by_oracle(view, validator_set):
+    tip = view.estimate()
+    while tip and tip != view.last_finalized_block:
+        oracle = CliqueOracle(tip, view, validator_set)
+        fault_tolerance, _ = oracle.check_estimate_safety()
+        if fault_tolerance > 0:
+            return tip
+        tip = tip.estimate
+
+    return None
+
+
+@pytest.mark.parametrize(
+    'mode',
+    [
+        ('rand'),
+        ('rrob'),
+        ('nofinal'),
+    ]
+)
+def test_sweep_matches_clique_oracle(generate_validator_set, mode):
+    validator_set = generate_validator_set(BlockchainProtocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker(mode),
+        BlockchainProtocol,
+        40,
+        40,
+        False,
+        False
+    )
+
+    for i in range(40):
+        simulation_runner.step()
+
+        view = simulation_runner.network.global_view
+        sweep = view.safety_sweep(validator_set)
+
+        for block, result in sweep.fault_tolerances().items():
+            oracle = CliqueOracle(block, view, validator_set)
+            fault_tolerance, num_node_ft = oracle.check_estimate_safety()
+            assert round(result[0], 6) == round(fault_tolerance, 6)
+            assert result[1] == num_node_ft
+
+        assert sweep.deepest_safe_block(view.last_finalized_block) == \
+            deepest_safe_block_by_oracle(view, validator_set)
+
+
+def test_safety_sweep_reused_until_view_changes(generate_validator_set):
+    validator_set = generate_validator_set(BlockchainProtocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker('rrob'),
+        BlockchainProtocol,
+        10,
+        10,
+        False,
+        False
+    )
+    simulation_runner.step()
+
+    view = simulation_runner.network.global_view
+    sweep = view.safety_sweep(validator_set)
+    assert view.safety_sweep(validator_set) is sweep
+
+    simulation_runner.step()
+    assert view.safety_sweep(validator_set) is not sweep
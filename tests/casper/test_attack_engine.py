@@ -0,0 +1,118 @@
+"""The attack engine testing module ... """
+import random as r
+
+import pytest
+
+from casper.binary.binary_protocol import BinaryProtocol
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+from casper.safety_oracles.adversary_models.adversary import Adversary
+from casper.safety_oracles.adversary_models.attack_engine import AttackEngine
+from casper.safety_oracles.adversary_models.model_bet import ModelBet
+from casper.safety_oracles.adversary_oracle import AdversaryOracle
+from casper.validator_set import ValidatorSet
+from simulations.simulation_runner import SimulationRunner
+from simulations.utils import message_maker
+
+
+def random_estimates_and_viewables(validator_set, on_candidate, seen_on_candidate):
+    latest_estimates = dict()
+    viewables = dict()
+    for validator in validator_set:
+        if r.random() < on_candidate:
+            latest_estimates[validator] = 0
+            viewables[validator] = {
+                val2: 0 if r.random() < seen_on_candidate else 1
+                for val2 in validator_set
+            }
+        else:
+            latest_estimates[validator] = 1
+            viewables[validator] = dict()
+
+    return latest_estimates, viewables
+
+
+def as_model_bets(latest_estimates, viewables):
+    latest_bets = {v: ModelBet(estimate, v) for v, estimate in latest_estimates.items()}
+    viewable_bets = {
+        v: {val2: ModelBet(estimate, val2) for val2, estimate in viewables[v].items()}
+        for v in viewables
+    }
+
+    return latest_bets, viewable_bets
+
+
+@pytest.mark.parametrize(
+    'num_validators, on_candidate, seen_on_candidate',
+    [
+        (5, 0.8, 0.7),
+        (10, 0.7, 0.6),
+        (20, 0.9, 0.55),
+        (40, 0.6, 0.5),
+        (40, 0.8, 0.6),
+        (40, 0.95, 0.8),
+    ]
+)
+def test_matches_adversary(num_validators, on_candidate, seen_on_candidate):
+    for i in range(20):
+        validator_set = ValidatorSet({
+            name: r.uniform(1, 100) for name in range(num_validators)
+        })
+        latest_estimates, viewables = random_estimates_and_viewables(
+            validator_set,
+            on_candidate,
+            seen_on_candidate
+        )
+        latest_bets, viewable_bets = as_model_bets(latest_estimates, viewables)
+
+        adversary = Adversary(0, latest_bets, viewable_bets, validator_set)
+        engine = AttackEngine(0, latest_estimates, viewables, validator_set)
+
+        assert engine.voting_with_attacker == adversary.voting_with_attacker
+        assert engine.voting_against_attacker == adversary.voting_against_attacker
+
+        assert engine.ideal_network_attack() == adversary.ideal_network_attack()
+
+
+@pytest.mark.parametrize(
+    'protocol, mode',
+    [
+        (BlockchainProtocol, 'rrob'),
+        (BlockchainProtocol, 'rand'),
+        (BinaryProtocol, 'rrob'),
+    ]
+)
+def test_oracle_matches_adversary(generate_validator_set, protocol, mode):
+    validator_set = generate_validator_set(protocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        message_maker(mode),
+        protocol,
+        30,
+        30,
+        False,
+        False
+    )
+
+    for i in range(30):
+        simulation_runner.step()
+
+        view = simulation_runner.network.global_view
+        for validator in validator_set.sorted_by_name()[:3]:
+            oracle = AdversaryOracle(view.latest_messages[validator], view, validator_set)
+            latest_bets, viewables = oracle.get_messages_and_viewables()
+            adversary = Adversary(
+                AdversaryOracle.CAN_ESTIMATE,
+                latest_bets,
+                viewables,
+                validator_set
+            )
+
+            latest_estimates, viewable_estimates = oracle.get_estimates_and_viewables()
+            engine = AttackEngine(
+                AdversaryOracle.CAN_ESTIMATE,
+                latest_estimates,
+                viewable_estimates,
+                validator_set
+            )
+
+            assert engine.ideal_network_attack() == adversary.ideal_network_attack()
@@ -0,0 +1,64 @@
+"""The frame writer testing module ... """
+from io import BytesIO
+
+from PIL import Image
+import pytest
+
+from casper.frame_writer import BackgroundGifWriter, FRAME_QUEUE_SIZE, GifWriter
+from casper.plot_tool import PlotTool, _pyplot
+
+
+def png_frame(color, size=(1200, 800)):
+    frame = BytesIO()
+    Image.new('RGB', size, color).save(frame, format='PNG')
+    return frame.getvalue()
+
+
+@pytest.mark.parametrize(
+    'writer_class',
+    [
+        (GifWriter),
+        (BackgroundGifWriter),
+    ]
+)
+def test_frames_streamed_to_gif(tmpdir, writer_class):
+    path = str(tmpdir.join('frames.gif'))
+    writer = writer_class(path, size=(300, 300))
+
+    colors = ['red', 'green', 'blue', 'white']
+    for color in colors:
+        writer.add_frame(png_frame(color))
+    writer.close()
+
+    assert writer.frame_count == len(colors)
+
+    gif = Image.open(path)
+    assert gif.n_frames == len(colors)
+    # thumbnails keep the aspect ratio of the frames
+    assert gif.size == (300, 200)
+
+
+def test_background_writer_fails_on_unwritable_path(tmpdir):
+    path = str(tmpdir.join('missing', 'frames.gif'))
+    writer = BackgroundGifWriter(path, size=(300, 300))
+
+    with pytest.raises(Exception, match="failed to write"):
+        for _ in range(4 * FRAME_QUEUE_SIZE):
+            writer.add_frame(png_frame('red'))
+        writer.close()
+
+
+def test_plot_tool_saves_frames_to_gif(tmpdir):
+    plot_tool = PlotTool(False, False, 's')
+    plot_tool.graph_path = str(tmpdir) + '/'
+
+    plt = _pyplot(False)
+    for i in range(3):
+        plt.plot([0, i], [0, 1])
+        plot_tool._save_frame(plt.gcf())
+        plt.close('all')
+    plot_tool.make_gif()
+
+    assert plot_tool.gif_writer is None
+    assert Image.open(str(tmpdir.join('mygif.gif'))).n_frames == 3
+    assert not tmpdir.listdir(lambda path: path.ext == '.png')
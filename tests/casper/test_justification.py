@@ -0,0 +1,72 @@
+"""The justification testing module ..."""
+import copy
+import random as r
+
+import pytest
+
+from casper.justification import Justification, PersistentMap
+
+
+@pytest.mark.parametrize(
+    'items',
+    [
+        ({}),
+        ({"face": 10}),
+        ({i: i * 2 for i in range(100)}),
+    ]
+)
+def test_persistent_map_matches_dict(items):
+    persistent_map = PersistentMap(items)
+
+    assert persistent_map == items
+    assert len(persistent_map) == len(items)
+    assert set(persistent_map) == set(items)
+    for key in items:
+        assert key in persistent_map
+        assert persistent_map[key] == items[key]
+    assert "missing" not in persistent_map
+    assert persistent_map.get("missing") is None
+
+    with pytest.raises(KeyError):
+        persistent_map["missing"]
+
+
+def test_persistent_map_set_does_not_change_original():
+    original = PersistentMap({i: i for i in range(10)})
+    derived = original.set(3, "three").set(10, "ten")
+
+    assert original == {i: i for i in range(10)}
+    assert derived[3] == "three"
+    assert derived[10] == "ten"
+    assert len(derived) == 11
+
+
+def test_persistent_map_random_updates():
+    expected = dict()
+    persistent_map = PersistentMap()
+    history = []
+
+    for i in range(2000):
+        key = r.randint(0, 300)
+        expected[key] = i
+        persistent_map = persistent_map.set(key, i)
+        history.append((persistent_map, dict(expected)))
+
+    for old_map, old_expected in history[::50]:
+        assert old_map == old_expected
+
+
+def test_persistent_map_copies():
+    persistent_map = PersistentMap({i: [i] for i in range(20)})
+
+    assert copy.copy(persistent_map) == persistent_map
+    assert copy.deepcopy(persistent_map) == persistent_map
+
+
+def test_justifications_share_latest_messages():
+    latest_messages = PersistentMap({"face": 10})
+    justification = Justification(latest_messages)
+
+    assert justification.latest_messages is latest_messages
+    assert Justification({"face": 10}).latest_messages == latest_messages
+    assert not Justification().latest_messages
@@ -33,3 +33,33 @@ def test_non_equality_of_copies_off_genesis():
     message_1 = Message(None, Justification(), validator_1)
 
     assert message_0 != message_1
+
+
+def test_display_height(validator):
+    validator_1 = Validator("v1", 11)
+
+    message_0 = Message(None, Justification(), validator)
+    message_1 = Message(None, Justification({validator: message_0}), validator_1)
+    message_2 = Message(
+        None,
+        Justification({validator: message_0, validator_1: message_1}),
+        validator
+    )
+
+    assert message_2.display_height == 2
+    assert message_1.display_height == 1
+    assert message_0.display_height == 0
+
+
+def test_display_height_of_long_chain(validator):
+    message = Message(None, Justification(), validator)
+    for i in range(5000):
+        message = Message(None, Justification({validator: message}), validator)
+
+    assert message.display_height == 5000
+
+
+def test_messages_are_slotted(validator):
+    message = Message(None, Justification(), validator)
+
+    assert not hasattr(message, '__dict__')
@@ -39,6 +39,24 @@ def test_propagate_message_to_validator(network):
     assert message == to_validator.view.latest_messages[from_validator]
 
 
+def test_propagate_messages_to_validators(network):
+    validators = network.validator_set.sorted_by_name()
+    messages = [network.get_message_from_validator(validator) for validator in validators]
+
+    deliveries = [
+        (message, receiver)
+        for message in messages
+        for receiver in validators
+        if receiver != message.sender
+    ]
+    network.propagate_messages_to_validators(deliveries)
+
+    for validator in validators:
+        assert set(messages) <= validator.view.messages
+        for message in messages:
+            assert message == validator.view.latest_messages[message.sender]
+
+
 @pytest.mark.skip(reason="test not yet implemented")
 def test_view_initialization():
     pass
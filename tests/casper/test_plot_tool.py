@@ -0,0 +1,126 @@
+"""The plot tool testing module ... """
+import subprocess
+import sys
+
+import pytest
+
+from casper.binary.binary_protocol import BinaryProtocol
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+from simulations.simulation_runner import SimulationRunner
+from simulations.utils import message_maker
+
+
+def test_importing_network_does_not_import_plotting():
+    code = (
+        "import sys\n"
+        "import casper.network\n"
+        "import simulations.experiment\n"
+        "plotting = {'matplotlib', 'networkx', 'imageio', 'PIL'}\n"
+        "assert not plotting & {name.split('.')[0] for name in sys.modules}"
+    )
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+@pytest.mark.parametrize(
+    'protocol',
+    [
+        (BlockchainProtocol),
+        (BinaryProtocol),
+    ]
+)
+def test_viewgraph_built_incrementally(generate_validator_set, protocol):
+    validator_set = generate_validator_set(protocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        message_maker('rand'),
+        protocol,
+        20,
+        1,
+        False,
+        False
+    )
+    view = simulation_runner.network.global_view
+    plot_tool = protocol.PlotTool(False, False, view, validator_set)
+
+    plot_tool.plot()
+    figure = plot_tool.figure
+    for i in range(20):
+        simulation_runner.step()
+        plot_tool.update(new_messages={
+            validator: validator.my_latest_message() for validator in validator_set
+        })
+        plot_tool.plot()
+
+        assert plot_tool.figure is figure
+        assert set(plot_tool._node_locations) == view.messages
+        num_nodes = sum(len(batch.get_offsets()) for batch in plot_tool._node_batches)
+        assert num_nodes == len(view.messages)
+
+        message_colors = getattr(plot_tool, 'block_fault_tolerance', None)
+        if message_colors is None:
+            message_colors = plot_tool.bet_fault_tolerance
+        for message in view.messages:
+            expected = plot_tool._node_color(message, message_colors, len(validator_set))
+            batch, index = plot_tool._node_locations[message]
+            facecolor = plot_tool._node_batches[batch].get_facecolors()[index]
+            assert tuple(facecolor) == pytest.approx(plot_tool._to_rgba(expected))
+
+
+@pytest.mark.parametrize(
+    'protocol',
+    [
+        (BlockchainProtocol),
+        (BinaryProtocol),
+    ]
+)
+def test_windowed_viewgraph(generate_validator_set, protocol):
+    window = 3
+    validator_set = generate_validator_set(protocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        message_maker('rand'),
+        protocol,
+        60,
+        1,
+        False,
+        False
+    )
+    view = simulation_runner.network.global_view
+    plot_tool = protocol.PlotTool(False, False, view, validator_set, window=window)
+
+    most_visible = 0
+    for i in range(60):
+        simulation_runner.step()
+        plot_tool.update(new_messages={
+            validator: validator.my_latest_message() for validator in validator_set
+        })
+        plot_tool.plot()
+
+        bottom = plot_tool.window_bottom(view)
+        visible = plot_tool.visible_messages(view)
+        assert set(plot_tool._node_locations) == visible
+        assert {m for m in view.messages if m.display_height >= bottom} <= visible
+
+        pinned = visible - {m for m in view.messages if m.display_height >= bottom}
+        if protocol == BlockchainProtocol:
+            block = view.estimate()
+            while block is not None and block != view.last_finalized_block:
+                assert block in visible
+                block = block.estimate
+        else:
+            assert not pinned
+
+        # a validator's display heights increase, so each has at most window + 1 drawn
+        assert len(visible - pinned) <= len(validator_set) * (window + 1)
+        live_batches = [batch for batch in plot_tool._node_batches if batch is not None]
+        assert len(live_batches) <= len(visible)
+
+        # state kept for drawn messages is bounded by the window, not by the run
+        most_visible = max(most_visible, len(visible))
+        assert len(plot_tool._node_batches) <= most_visible
+        assert not plot_tool._justification_edges
+        assert set(plot_tool.message_labels) <= visible
+        if protocol == BlockchainProtocol:
+            assert set(plot_tool.block_fault_tolerance) <= visible
+        else:
+            assert set(plot_tool.bet_fault_tolerance) <= visible
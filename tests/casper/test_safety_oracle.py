@@ -1,4 +1,15 @@
 """The safety oracle testing module ... """
+import copy
+import itertools
+
+import pytest
+
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+from casper.safety_oracles.agreement_graph import validators_agree
+from casper.safety_oracles.clique_oracle import CliqueOracle
+from casper.validator import Validator
+from simulations.simulation_runner import SimulationRunner
+from simulations.utils import message_maker
 
 def test_round_robin_safety(test_lang_runner):
     test_string = (
@@ -51,3 +62,94 @@ def test_no_majority_fork_safe_after_union(test_lang_runner):
     )
     weights = {0: 5, 1: 4.5, 2: 6, 3: 4, 4: 5.25}
     test_lang_runner(test_string, weights)
+
+
+@pytest.mark.parametrize(
+    'mode',
+    [
+        ('rand'),
+        ('rrob'),
+        ('nofinal'),
+    ]
+)
+def test_agreement_graph_matches_fresh_edges(generate_validator_set, mode):
+    validator_set = generate_validator_set(BlockchainProtocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        message_maker(mode),
+        BlockchainProtocol,
+        60,
+        60,
+        False,
+        False
+    )
+    view = simulation_runner.network.global_view
+
+    for i in range(60):
+        simulation_runner.step()
+
+        tip = view.estimate()
+        while tip:
+            with_candidate = view.agreement_graph.with_candidate(tip, validator_set)
+            edges = view.agreement_graph.edges(tip, validator_set)
+
+            expected_with_candidate = {
+                v for v in validator_set
+                if v in view.latest_messages and not tip.conflicts_with(view.latest_messages[v])
+            }
+            expected_edges = {
+                frozenset((val1, val2))
+                for val1, val2 in itertools.combinations(expected_with_candidate, 2)
+                if validators_agree(tip, val1, val2, view)
+            }
+
+            assert with_candidate == expected_with_candidate
+            assert len(edges) == len(expected_edges)
+            assert {frozenset(edge) for edge in edges} == expected_edges
+
+            tip = tip.estimate
+
+
+def test_view_caches_safety_results(network):
+    class CountingOracle(CliqueOracle):
+        checks = 0
+
+        def check_estimate_safety(self):
+            CountingOracle.checks += 1
+            return super().check_estimate_safety()
+
+    view = network.global_view
+    candidate = view.estimate()
+
+    result = view.check_estimate_safety(candidate, network.validator_set, CountingOracle)
+    assert view.check_estimate_safety(candidate, network.validator_set, CountingOracle) == result
+    assert CountingOracle.checks == 1
+
+    version = view.version
+    network.get_message_from_validator(network.validator_set.sorted_by_name()[0])
+    assert view.version > version
+
+    view.check_estimate_safety(candidate, network.validator_set, CountingOracle)
+    assert CountingOracle.checks == 2
+
+
+def test_view_caches_safety_results_per_validator_set(network):
+    class CountingOracle(CliqueOracle):
+        checks = 0
+
+        def check_estimate_safety(self):
+            CountingOracle.checks += 1
+            return super().check_estimate_safety()
+
+    view = network.global_view
+    candidate = view.estimate()
+
+    # the same validators, outweighed by one that has sent no messages
+    other_set = copy.copy(network.validator_set)
+    other_set.validators = network.validator_set.validators | {Validator(10 ** 6, 10 ** 6)}
+
+    view.check_estimate_safety(candidate, network.validator_set, CountingOracle)
+    result = view.check_estimate_safety(candidate, other_set, CountingOracle)
+    assert CountingOracle.checks == 2
+    assert result == CliqueOracle(candidate, view, other_set).check_estimate_safety()
+    assert result == (0, 0)
@@ -3,8 +3,11 @@
 import random as r
 import pytest
 
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
 from casper.validator_set import ValidatorSet
 import casper.utils as utils
+from simulations.simulation_runner import SimulationRunner
+from simulations.utils import message_maker
 
 
 @pytest.mark.parametrize(
@@ -38,3 +41,63 @@ def test_get_weight(weights, expected_weight, validator_names):
 )
 def test_get_weight_empty(empty_param):
     assert utils.get_weight(empty_param) == 0
+
+
+def exists_free_message_by_walking_justifications(estimate, val, sequence_num, view):
+    curr_message = view.latest_messages[val]
+
+    while curr_message.sequence_number >= sequence_num:
+        if estimate.conflicts_with(curr_message):
+            return True
+
+        if curr_message.sequence_number == 0:
+            break
+
+        curr_message = curr_message.justification.latest_messages[val]
+
+    return False
+
+
+@pytest.mark.parametrize(
+    'mode',
+    [
+        ('rand'),
+        ('nofinal'),
+    ]
+)
+def test_exists_free_message(generate_validator_set, mode):
+    validator_set = generate_validator_set(BlockchainProtocol)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        message_maker(mode),
+        BlockchainProtocol,
+        40,
+        40,
+        False,
+        False
+    )
+    for i in range(40):
+        simulation_runner.step()
+
+    view = simulation_runner.network.global_view
+    for val in validator_set:
+        for estimate in list(view.messages)[:10]:
+            for sequence_num in range(view.latest_messages[val].sequence_number + 2):
+                assert utils.exists_free_message(estimate, val, sequence_num, view) == \
+                    exists_free_message_by_walking_justifications(
+                        estimate, val, sequence_num, view
+                    )
+
+
+def test_messages_by_sender(network):
+    for validator in network.validator_set:
+        network.get_message_from_validator(validator)
+
+    view = network.global_view
+    for validator in network.validator_set:
+        messages = view.get_messages(validator)
+        assert len(messages) == 2
+        assert messages[-1] == view.latest_messages[validator]
+        for sequence_number, message in enumerate(messages):
+            assert message.sequence_number == sequence_number
+            assert view.get_message(validator, sequence_number) == message
@@ -0,0 +1,89 @@
+"""The weighted clique testing module ... """
+import itertools
+import random as r
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from casper.safety_oracles.weighted_clique import (
+    find_max_weight_clique,
+    find_max_weight_clique_in_matrix
+)
+
+
+def max_weight_clique_by_enumeration(weights, edges):
+    graph = nx.Graph()
+    graph.add_edges_from(edges)
+
+    max_clique = []
+    max_weight = 0
+    for clique in nx.find_cliques(graph):
+        test_weight = sum(weights[v] for v in clique)
+        if test_weight > max_weight:
+            max_clique = clique
+            max_weight = test_weight
+
+    return set(max_clique), max_weight
+
+
+@pytest.mark.parametrize(
+    'num_vertices, edge_probability',
+    [
+        (5, 0.5),
+        (10, 0.3),
+        (20, 0.5),
+        (30, 0.8),
+        (40, 0.95),
+    ]
+)
+def test_matches_enumeration(num_vertices, edge_probability):
+    for i in range(10):
+        edges = [
+            (v1, v2) for v1, v2 in itertools.combinations(range(num_vertices), 2)
+            if r.random() < edge_probability
+        ]
+        weights = {v: r.uniform(1, 100) for edge in edges for v in edge}
+
+        clique, weight = find_max_weight_clique(weights, edges)
+        expected_clique, expected_weight = max_weight_clique_by_enumeration(weights, edges)
+
+        assert clique == expected_clique
+        assert round(weight, 6) == round(expected_weight, 6)
+
+
+def test_complete_graph():
+    weights = {v: v + 1 for v in range(200)}
+    edges = list(itertools.combinations(range(200), 2))
+
+    clique, weight = find_max_weight_clique(weights, edges)
+
+    assert clique == set(range(200))
+    assert weight == sum(weights.values())
+
+
+def test_empty_graph():
+    assert find_max_weight_clique({}, []) == (set(), 0)
+
+
+def test_matrix_matches_edges():
+    for i in range(20):
+        num_vertices = r.randint(1, 25)
+        adjacency = np.zeros((num_vertices, num_vertices), dtype=bool)
+        for v1, v2 in itertools.combinations(range(num_vertices), 2):
+            if r.random() < 0.6:
+                adjacency[v1, v2] = adjacency[v2, v1] = True
+
+        weights = [r.uniform(1, 100) for v in range(num_vertices)]
+        edges = list(zip(*np.nonzero(np.triu(adjacency))))
+
+        clique, weight = find_max_weight_clique_in_matrix(weights, adjacency)
+        expected_clique, expected_weight = find_max_weight_clique(dict(enumerate(weights)), edges)
+
+        assert clique == expected_clique
+        assert round(weight, 6) == round(expected_weight, 6)
+        assert all(adjacency[v1, v2] for v1, v2 in itertools.combinations(clique, 2))
+
+
+def test_empty_matrix():
+    assert find_max_weight_clique_in_matrix([], np.zeros((0, 0), dtype=bool)) == (set(), 0)
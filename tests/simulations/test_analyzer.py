@@ -1,3 +1,5 @@
+import statistics
+
 import pytest
 
 from casper.blockchain.blockchain_protocol import BlockchainProtocol
@@ -63,3 +65,63 @@ def test_orphan_rate(
         expected
         ):
     pass
+
+
+def expected_data(analyzer):
+    view = analyzer.global_view
+    safe = analyzer.safe_messages()
+    unsafe = analyzer.unsafe_messages()
+    bivalent = view.messages - safe - unsafe
+
+    to_check = set(bivalent)
+    if view.last_finalized_block:
+        to_check.add(view.last_finalized_block)
+    with_children = [message for message in to_check if message in view.children]
+    branches = sum(len(view.children[message]) for message in with_children)
+
+    latencies = [view.when_finalized[m] - view.when_added[m] for m in safe]
+
+    return {
+        'num_messages': len(view.messages),
+        'num_safe_messages': len(safe),
+        'num_unsafe_messages': len(unsafe),
+        'num_bivalent_messages': len(bivalent),
+        'bivalent_message_branching_factor':
+            branches / len(with_children) if with_children else 0,
+        'latency_to_finality': statistics.mean(latencies) if latencies else None,
+        'orphan_rate':
+            len(unsafe) / (len(unsafe) + len(safe)) if unsafe or safe else 0,
+    }
+
+
+@pytest.mark.parametrize(
+    'mode',
+    [
+        ('rand'),
+        ('rrob'),
+        ('full'),
+        ('nofinal'),
+    ]
+)
+def test_incremental_data_matches_view(validator_set, mode):
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker(mode),
+        BlockchainProtocol,
+        100,
+        20,
+        False,
+        False
+    )
+    for i in range(5):
+        simulation_runner.step()
+
+    # an analyzer made part way through a simulation starts from the view so far
+    analyzer = Analyzer(simulation_runner)
+
+    for i in range(60):
+        simulation_runner.step()
+
+        expected = expected_data(analyzer)
+        for data in expected:
+            assert getattr(analyzer, data)() == expected[data]
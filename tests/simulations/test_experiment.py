@@ -0,0 +1,103 @@
+import statistics
+
+import pytest
+
+from casper.binary.binary_protocol import BinaryProtocol
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+from simulations.experiment import Experiment
+from simulations.utils import validator_generator
+
+
+VALIDATOR_INFO = {
+    "gen_type": "gauss",
+    "num_validators": 5,
+    "mu": 100,
+    "sigma": 20,
+    "min_weight": 20
+}
+
+
+def run_experiment(protocol, msg_mode, data, workers, seed):
+    experiment = Experiment(
+        "test",
+        data,
+        4,
+        validator_generator(VALIDATOR_INFO, protocol),
+        msg_mode,
+        protocol,
+        20,
+        5,
+        workers=workers,
+        seed=seed
+    )
+    experiment.run()
+
+    return experiment
+
+
+def simulation_data(experiment):
+    rows = experiment.read_simulation_data()
+    return sorted(rows, key=lambda row: (row['sim_id'], row['interval']))
+
+
+@pytest.mark.parametrize(
+    'protocol, msg_mode, data',
+    [
+        (BlockchainProtocol, 'rand', ['num_messages', 'num_safe_messages', 'safe_to_tip_length']),
+        (BlockchainProtocol, 'full', ['num_safe_messages', 'latency_to_finality']),
+        (BinaryProtocol, 'rand', ['num_messages']),
+    ]
+)
+def test_results_do_not_depend_on_workers(tmpdir, protocol, msg_mode, data):
+    tmpdir.chdir()
+    serial = run_experiment(protocol, msg_mode, data, 1, 42)
+    serial_data = simulation_data(serial)
+
+    again = run_experiment(protocol, msg_mode, data, 1, 42)
+    assert again.analyzer_data == serial.analyzer_data
+    assert simulation_data(again) == serial_data
+
+    parallel = run_experiment(protocol, msg_mode, data, 3, 42)
+    assert parallel.analyzer_data == serial.analyzer_data
+    assert simulation_data(parallel) == serial_data
+
+
+def test_simulations_are_seeded_separately(tmpdir):
+    tmpdir.chdir()
+    experiment = run_experiment(BlockchainProtocol, 'rand', ['num_safe_messages'], 1, 7)
+    rows = simulation_data(experiment)
+
+    assert [(row['sim_id'], row['interval']) for row in rows] == \
+        [(sim_id, interval) for sim_id in range(4) for interval in range(4)]
+    assert len({str(row['data']) for row in rows if row['interval'] == 3}) > 1
+
+
+def test_aggregates_match_statistics(tmpdir):
+    tmpdir.chdir()
+    data = ['num_safe_messages', 'prop_safe_messages', 'latency_to_finality']
+    experiment = run_experiment(BlockchainProtocol, 'rrob', data, 1, 3)
+    rows = simulation_data(experiment)
+
+    for interval in range(experiment.intervals):
+        aggregated = experiment.analyzer_data['aggregated'][interval]
+        for d in data:
+            values = [
+                row['data'][d] for row in rows
+                if row['interval'] == interval and row['data'][d]
+            ]
+            if len(values) > 1:
+                assert aggregated[d + '-mean'] == statistics.mean(values)
+                assert aggregated[d + '-stdev'] == pytest.approx(statistics.stdev(values))
+            else:
+                assert aggregated[d + '-mean'] is None
+
+
+def test_partly_written_row_is_left_out(tmpdir):
+    tmpdir.chdir()
+    experiment = run_experiment(BlockchainProtocol, 'rand', ['num_messages'], 1, 5)
+    rows = simulation_data(experiment)
+
+    with open(experiment.simulation_data_file, 'a') as f:
+        f.write('{"sim_id": 4, "interval"')
+
+    assert simulation_data(experiment) == rows
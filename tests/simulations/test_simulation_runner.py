@@ -1,3 +1,4 @@
+import random
 import sys
 import pytest
 
@@ -5,6 +6,7 @@ from casper.blockchain.blockchain_protocol import BlockchainProtocol
 from casper.binary.binary_protocol import BinaryProtocol
 
 from casper.network import Network
+from casper.plot_tool import NullPlotTool
 from simulations.simulation_runner import SimulationRunner
 import simulations.utils as utils
 
@@ -48,6 +50,31 @@ def test_new_simulation_runner(generate_validator_set, protocol, mode, rounds, r
         assert simulation_runner.report_interval == 1
 
 
+@pytest.mark.parametrize(
+    'protocol',
+    [
+        (BlockchainProtocol),
+        (BinaryProtocol),
+    ]
+)
+def test_headless_simulation_runner(generate_validator_set, protocol):
+    simulation_runner = SimulationRunner(
+        generate_validator_set(protocol),
+        utils.message_maker('rand'),
+        protocol,
+        10,
+        1,
+        False,
+        False
+    )
+
+    assert simulation_runner.headless
+    assert isinstance(simulation_runner.plot_tool, NullPlotTool)
+
+    simulation_runner.run()
+    assert simulation_runner.round == 10
+
+
 @pytest.mark.parametrize(
     'rounds',
     [
@@ -113,3 +140,53 @@ def test_simulation_runner_send_messages(
         simulation_runner.step()
         assert len(simulation_runner.network.global_view.messages) == \
             (i + 1) * messages_generated_per_round + len(validator_set)
+
+
+def run_seeded_simulation(protocol, mode, seed):
+    rng = random.Random(seed)
+    validator_set = utils.generate_random_gaussian_validator_set(protocol, 6, rng=rng)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker(mode, rng),
+        protocol,
+        40,
+        40,
+        False,
+        False
+    )
+
+    names = {validator: validator.name for validator in validator_set}
+    for message in simulation_runner.network.global_view.messages:
+        names[message] = (-1, message.sender.name)
+
+    trace = []
+    for i in range(40):
+        simulation_runner.step()
+
+        view = simulation_runner.network.global_view
+        new_messages = sorted(
+            (message for message in view.messages if message not in names),
+            key=lambda message: message.sender.name
+        )
+        for message in new_messages:
+            names[message] = (i, message.sender.name)
+            trace.append((
+                names[message],
+                names.get(message.estimate, message.estimate),
+                sorted(names[m] for m in message.justification.latest_messages.values())
+            ))
+
+    return [v.weight for v in validator_set.sorted_by_name()], trace
+
+
+@pytest.mark.parametrize(
+    'protocol, mode',
+    [
+        (BlockchainProtocol, 'rand'),
+        (BlockchainProtocol, 'full'),
+        (BinaryProtocol, 'rand'),
+    ]
+)
+def test_seeded_simulations_replay(protocol, mode):
+    assert run_seeded_simulation(protocol, mode, 9) == run_seeded_simulation(protocol, mode, 9)
+    assert run_seeded_simulation(protocol, mode, 9) != run_seeded_simulation(protocol, mode, 10)
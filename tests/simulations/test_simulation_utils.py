@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from casper.blockchain.blockchain_protocol import BlockchainProtocol
@@ -115,3 +117,23 @@ def test_no_final_message_maker(validator_set):
             assert len(second_message_path) == 2
             assert second_message_path[0] == senders[(index + 1) % len(validator_set)]
             assert second_message_path[1] == receivers[(index + 1) % len(validator_set)]
+
+
+def test_seeded_validator_sets_are_the_same():
+    validator_sets = [
+        generate_random_gaussian_validator_set(BlockchainProtocol, 10, rng=random.Random(3))
+        for i in range(2)
+    ]
+
+    weights = [
+        [v.weight for v in validator_set.sorted_by_name()]
+        for validator_set in validator_sets
+    ]
+    assert weights[0] == weights[1]
+
+
+def test_seeded_random_message_makers_are_the_same(validator_set):
+    msg_gens = [message_maker("rand", random.Random(5)) for i in range(2)]
+
+    for i in range(20):
+        assert msg_gens[0](validator_set) == msg_gens[1](validator_set)
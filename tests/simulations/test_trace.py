@@ -0,0 +1,189 @@
+import random
+
+import pytest
+
+from casper.binary.binary_protocol import BinaryProtocol
+from casper.blockchain.blockchain_protocol import BlockchainProtocol
+
+from simulations.analyzer import Analyzer
+from simulations.simulation_runner import SimulationRunner
+from simulations.trace import TraceReplayer
+import simulations.utils as utils
+
+ANALYZER_DATA = [
+    'num_messages',
+    'num_safe_messages',
+    'safe_tip_height',
+    'bivalent_message_depth',
+    'latency_to_finality',
+    'orphan_rate',
+]
+
+
+def collect(analyzer):
+    return [getattr(analyzer, name)() for name in ANALYZER_DATA]
+
+
+def view_state(view, ids):
+    """Returns the state of a view, with messages named by their ids in the trace."""
+    state = [
+        sorted((validator.name, ids[message]) for validator, message in
+               view.latest_messages.items()),
+        sorted(ids[message] for message in view.messages),
+    ]
+    if hasattr(view, 'last_finalized_block'):
+        block = view.last_finalized_block
+        state.append(ids[block] if block else None)
+    else:
+        bet = view.last_finalized_estimate
+        state.append(ids[bet] if bet else None)
+
+    return state
+
+
+@pytest.mark.parametrize(
+    'protocol, mode, trace_name',
+    [
+        (BlockchainProtocol, 'rand', 'trace.jsonl'),
+        (BlockchainProtocol, 'full', 'trace.jsonl'),
+        (BlockchainProtocol, 'rand', 'trace.jsonl.gz'),
+        (BinaryProtocol, 'rand', 'trace.jsonl'),
+    ]
+)
+def test_replay_matches_simulation(tmpdir, protocol, mode, trace_name):
+    trace = str(tmpdir.join(trace_name))
+    rng = random.Random(3)
+    validator_set = utils.generate_random_gaussian_validator_set(protocol, 5, rng=rng)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker(mode, rng),
+        protocol,
+        30,
+        30,
+        False,
+        False,
+        trace=trace
+    )
+    analyzer = Analyzer(simulation_runner) if protocol == BlockchainProtocol else None
+    recorded_ids = simulation_runner.trace_recorder.ids
+
+    simulation_runner.run()
+
+    replayer = TraceReplayer(trace)
+    replay_analyzer = Analyzer(replayer) if protocol == BlockchainProtocol else None
+
+    assert replayer.protocol == protocol
+    assert sorted((v.name, v.weight) for v in replayer.validator_set) == \
+        sorted((v.name, v.weight) for v in validator_set)
+
+    replayer.run()
+    replayed_ids = {message: i for i, message in enumerate(replayer.messages)}
+
+    assert replayer.round == simulation_runner.round
+    assert view_state(replayer.network.global_view, replayed_ids) == \
+        view_state(simulation_runner.network.global_view, recorded_ids)
+    for validator in validator_set:
+        assert view_state(replayer.validators[validator.name].view, replayed_ids) == \
+            view_state(validator.view, recorded_ids)
+
+    for message, i in recorded_ids.items():
+        replayed = replayer.messages[i]
+        assert replayed.sender.name == message.sender.name
+        assert replayed.sequence_number == message.sequence_number
+        assert replayed.display_height == message.display_height
+        replayed_justification = replayed.justification.latest_messages
+        justification = message.justification.latest_messages
+        assert {v.name: replayed_ids[m] for v, m in replayed_justification.items()} == \
+            {v.name: recorded_ids[m] for v, m in justification.items()}
+
+    if analyzer:
+        assert collect(replay_analyzer) == collect(analyzer)
+
+
+@pytest.mark.parametrize('trace_name', ['trace.jsonl', 'trace.jsonl.gz'])
+def test_replay_by_round(tmpdir, trace_name):
+    trace = str(tmpdir.join(trace_name))
+    rng = random.Random(4)
+    validator_set = utils.generate_random_gaussian_validator_set(BlockchainProtocol, 5, rng=rng)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker('rand', rng),
+        BlockchainProtocol,
+        20,
+        20,
+        False,
+        False,
+        trace=trace
+    )
+    num_messages = [len(simulation_runner.network.global_view.messages)]
+    for i in range(20):
+        simulation_runner.step()
+        num_messages.append(len(simulation_runner.network.global_view.messages))
+
+    # rounds recorded so far can be replayed while the trace is still open
+    replayer = TraceReplayer(trace, check_safety=False)
+    assert len(replayer.network.global_view.messages) == num_messages[0]
+    while replayer.step():
+        assert len(replayer.network.global_view.messages) == num_messages[replayer.round]
+
+    assert replayer.round == 20
+
+
+def test_replay_truncated_trace(tmpdir):
+    trace = str(tmpdir.join('trace.jsonl'))
+    rng = random.Random(5)
+    validator_set = utils.generate_random_gaussian_validator_set(BlockchainProtocol, 5, rng=rng)
+    simulation_runner = SimulationRunner(
+        validator_set,
+        utils.message_maker('rand', rng),
+        BlockchainProtocol,
+        10,
+        10,
+        False,
+        False,
+        trace=trace
+    )
+    simulation_runner.run()
+
+    # a trace cut off part way through writing an event
+    with open(trace, 'a') as trace_file:
+        trace_file.write('{"type": "round", "ro')
+
+    replayer = TraceReplayer(trace, check_safety=False)
+    replayer.run()
+
+    assert replayer.round == 10
+    assert len(replayer.messages) == len(simulation_runner.network.global_view.messages)
+
+
+def test_run_closes_trace_on_error(tmpdir):
+    trace = str(tmpdir.join('trace.jsonl.gz'))
+    rng = random.Random(6)
+    validator_set = utils.generate_random_gaussian_validator_set(BlockchainProtocol, 5, rng=rng)
+    message_maker = utils.message_maker('rand', rng)
+    rounds = []
+
+    def failing_message_maker(validators):
+        if len(rounds) == 5:
+            raise RuntimeError("interrupted")
+        rounds.append(validators)
+        return message_maker(validators)
+
+    simulation_runner = SimulationRunner(
+        validator_set,
+        failing_message_maker,
+        BlockchainProtocol,
+        10,
+        10,
+        False,
+        False,
+        trace=trace
+    )
+    with pytest.raises(RuntimeError):
+        simulation_runner.run()
+
+    assert simulation_runner.trace_recorder.trace.closed
+
+    replayer = TraceReplayer(trace, check_safety=False)
+    replayer.run()
+    assert replayer.round == 5